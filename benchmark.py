@@ -0,0 +1,362 @@
+"""Headless benchmark for the Polyglot capture -> OCR -> translate path
+
+Replays directories of recorded frames (PNG/JPG, in file name order) through
+change detection, preprocessing, OCR, the translation cache and a mock
+translator, then reports per-stage latency percentiles, throughput and memory.
+
+    python benchmark.py --generate workloads
+    python benchmark.py workloads/* --json results.json
+    python benchmark.py workloads/* --baseline results.json
+    python benchmark.py workloads/subtitles --regions 1,2,4,8,16 --ocr-processes 8
+"""
+import argparse
+import functools
+import hashlib
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+
+from polyglot import (
+    CONFIG, Metrics, OCRProcessPool, RegionProcessor, TranslationCache, TranslationResult,
+    TranslationService, create_ocr_engine, create_region_data
+)
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows
+
+FRAME_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+class MockTranslator:
+    """Stands in for a translation API with a fixed per-request latency"""
+    def __init__(self, latency_ms=80):
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        self.characters = 0
+        
+    def translate_many(self, texts, target_lang, source_lang='auto'):
+        self.requests += 1
+        self.characters += sum(len(text) for text in texts)
+        time.sleep(self.latency)
+        return [TranslationResult(f"[{target_lang}] {text}", source_lang, "mock") for text in texts]
+
+class MockOCREngine:
+    """Deterministic OCR stand-in for machines without Tesseract
+    
+    With cpu_bound the latency is spent spinning in Python, like real OCR work
+    holding a core, instead of sleeping.
+    """
+    name = "mock"
+    
+    def __init__(self, latency_ms=40, cpu_bound=False):
+        self.latency = latency_ms / 1000.0
+        self.cpu_bound = cpu_bound
+        
+    def image_to_data(self, image):
+        if self.cpu_bound:
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+        else:
+            time.sleep(self.latency)
+        # Same pixels always read as the same "word"
+        word = 'w' + hashlib.blake2b(np.asarray(image).tobytes()).hexdigest()[:6]
+        height, width = np.asarray(image).shape[:2]
+        return {
+            'level': [5], 'page_num': [1], 'block_num': [1], 'par_num': [1],
+            'line_num': [1], 'word_num': [1], 'left': [0], 'top': [0],
+            'width': [width], 'height': [height], 'conf': [95], 'text': [word]
+        }
+        
+    def close(self):
+        pass
+
+def load_frames(directory):
+    """Load the frames of a workload directory as RGB arrays"""
+    names = sorted(n for n in os.listdir(directory) if n.lower().endswith(FRAME_EXTENSIONS))
+    frames = []
+    for name in names:
+        img = cv2.imread(os.path.join(directory, name), cv2.IMREAD_COLOR)
+        if img is not None:
+            frames.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    return frames
+
+def generate_workloads(out_dir, count=120, seed=1234):
+    """Write the reference workloads: static UI, scrolling text and subtitles"""
+    rng = np.random.default_rng(seed)
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    words = ("menu settings window translate region overlay update message "
+             "player status inventory quest dialog options audio video").split()
+             
+    def sentence(i):
+        picked = [words[(i * 7 + k * 3) % len(words)] for k in range(4 + i % 4)]
+        return ' '.join(picked).capitalize()
+        
+    def write(name, frames):
+        directory = os.path.join(out_dir, name)
+        os.makedirs(directory, exist_ok=True)
+        for i, frame in enumerate(frames):
+            cv2.imwrite(os.path.join(directory, f"frame_{i:04d}.png"), frame)
+        print(f"Wrote {len(frames)} frames to {directory}")
+        
+    # Static UI: identical toolbar, only a text cursor blinks
+    base = np.full((160, 640, 3), 235, np.uint8)
+    for row, label in enumerate(("File  Edit  View  Help", "Settings saved", "Ready")):
+        cv2.putText(base, label, (12, 36 + row * 45), font, 0.8, (30, 30, 30), 2)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        if i % 2:
+            cv2.line(frame, (300, 110), (300, 135), (30, 30, 30), 2)
+        frames.append(frame)
+    write("static_ui", frames)
+    
+    # Scrolling text: a chat log gains one line every 4 frames
+    line_height = 32
+    frames = []
+    for i in range(count):
+        frame = np.full((256, 640, 3), 30, np.uint8)
+        newest = i // 4
+        for row in range(8):
+            index = newest - 7 + row
+            if index >= 0:
+                cv2.putText(frame, f"user{index % 5}: {sentence(index)}", (10, 24 + row * line_height),
+                            font, 0.6, (220, 220, 220), 1)
+        frames.append(frame)
+    write("scrolling_text", frames)
+    
+    # Subtitles: moving video background, subtitle changes every 15 frames
+    frames = []
+    for i in range(count):
+        frame = rng.integers(0, 120, (240, 640, 3), dtype=np.uint8)
+        frame = cv2.GaussianBlur(frame, (9, 9), 0)
+        cv2.rectangle(frame, (0, 180), (640, 240), (0, 0, 0), -1)
+        cv2.putText(frame, sentence(i // 15), (20, 220), font, 0.8, (255, 255, 255), 2)
+        frames.append(frame)
+    write("subtitles", frames)
+
+def load_translator(spec, latency_ms):
+    """Build the mock translator or import one given as module:Class"""
+    if not spec:
+        return MockTranslator(latency_ms)
+    module_name, _, class_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)()
+
+def engine_factory(name, latency_ms, cpu_bound=False):
+    """Picklable constructor for the chosen OCR engine"""
+    if name == "mock":
+        return functools.partial(MockOCREngine, latency_ms, cpu_bound)
+    CONFIG["ocr_backend"] = name
+    return create_ocr_engine
+
+def create_engine(name, latency_ms, cpu_bound=False):
+    return engine_factory(name, latency_ms, cpu_bound)()
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_workload(name, frames, translator, ocr_engine, target_lang='es'):
+    """Replay frames through the processing stages and summarise the timings"""
+    metrics = Metrics()
+    processor = RegionProcessor(ocr_engine, metrics=metrics)
+    cache = TranslationCache(CONFIG["cache_size"], fuzzy_threshold=CONFIG.get("fuzzy_threshold"))
+    service = TranslationService(translator, cache, metrics=metrics)
+    height, width = frames[0].shape[:2]
+    region_data = create_region_data(0, (0, 0, width, height))
+    
+    requests_before = getattr(translator, 'requests', 0)
+    characters_before = getattr(translator, 'characters', 0)
+    skipped = 0
+    start = time.perf_counter()
+    for frame in frames:
+        frame_start = time.perf_counter()
+        changed = processor.detect_change(region_data, frame)
+        if changed is None:
+            skipped += 1
+        else:
+            blocks = processor.ocr_region(region_data, changed)
+            texts = [text for _, text in blocks or []]
+            if texts:
+                service.translate_texts(texts, target_lang)
+        metrics.record('frame', time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'workload': name,
+        'frames': len(frames),
+        'frames_skipped': skipped,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_fps': round(len(frames) / elapsed, 2) if elapsed else None,
+        'ocr_cache_hit_ratio': round(processor.ocr_cache.hit_ratio, 3),
+        'translator_requests': getattr(translator, 'requests', 0) - requests_before,
+        'characters_sent': getattr(translator, 'characters', 0) - characters_before,
+        'stages': metrics.snapshot()['stages']
+    }
+
+def run_scaling(frames, region_counts, factory, processes, threads):
+    """OCR the same frame stream in 1..N regions at once and report throughput
+    
+    The OCR cache is disabled so every frame of every region really is read.
+    """
+    CONFIG["ocr_cache_size"] = 0
+    results = []
+    for count in region_counts:
+        metrics = Metrics()
+        pool = OCRProcessPool(processes, factory) if processes else None
+        processor = RegionProcessor(None if pool else factory(), metrics=metrics, ocr_pool=pool)
+        regions = [create_region_data(i, (0, 0, frames[0].shape[1], frames[0].shape[0])) for i in range(count)]
+        # Offset each region's stream so regions do not read identical frames in lockstep
+        jobs = [(region, frames[(i + region['id'] * 7) % len(frames)]) for i in range(len(frames)) for region in regions]
+        
+        def read(job):
+            region, frame = job
+            start = time.perf_counter()
+            processor.ocr_region(region, frame)
+            metrics.record('region_frame', time.perf_counter() - start, region['id'])
+            
+        # Warm the worker processes up before timing
+        read(jobs[0])
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(threads, processes, 1)) as executor:
+            list(executor.map(read, jobs))
+        elapsed = time.perf_counter() - start
+        processor.close()
+        
+        latency = metrics.snapshot()['stages']['region_frame']
+        results.append({
+            'regions': count,
+            'frames': len(jobs),
+            'elapsed_s': round(elapsed, 3),
+            'frames_per_s': round(len(jobs) / elapsed, 2),
+            'frame_p50_ms': latency['p50_ms'],
+            'frame_p95_ms': latency['p95_ms']
+        })
+        print(f"  {count:>3} regions: {len(jobs) / elapsed:8.2f} frames/s, "
+              f"p50 {latency['p50_ms']:.1f} ms, p95 {latency['p95_ms']:.1f} ms per frame")
+    return results
+
+def find_regressions(results, baseline, tolerance):
+    """Compare p95 latencies against a previous run"""
+    previous = {r['workload']: r for r in baseline.get('workloads', [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result['workload'])
+        if not old:
+            continue
+        for stage, stats in result['stages'].items():
+            old_stats = old['stages'].get(stage)
+            if old_stats and old_stats['p95_ms'] > 0 and stats['p95_ms'] > old_stats['p95_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{result['workload']}/{stage}: p95 {old_stats['p95_ms']:.2f} -> {stats['p95_ms']:.2f} ms"
+                )
+    return regressions
+
+def print_report(result):
+    print(f"\n{result['workload']}: {result['frames']} frames, {result['throughput_fps']} fps, "
+          f"{result['frames_skipped']} skipped, OCR cache {result['ocr_cache_hit_ratio']:.0%} hits, "
+          f"{result['translator_requests']} requests / {result['characters_sent']} chars")
+    print(f"  {'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:<12}{stats['count']:>7}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Polyglot pipeline benchmark")
+    parser.add_argument("workloads", nargs="*", help="Directories of recorded frames")
+    parser.add_argument("--generate", metavar="DIR", help="Write the reference workloads to DIR and exit")
+    parser.add_argument("--ocr", default="mock", choices=["mock", "auto", "tesserocr", "pytesseract"],
+                        help="OCR backend (mock needs no Tesseract install)")
+    parser.add_argument("--ocr-latency", type=float, default=40, help="Mock OCR latency in ms")
+    parser.add_argument("--ocr-cpu", action="store_true", help="Mock OCR burns CPU instead of sleeping")
+    parser.add_argument("--regions", metavar="N,N,...", help="Measure OCR scaling for these region counts")
+    parser.add_argument("--ocr-processes", type=int, default=0, help="OCR worker processes (0 = threads only)")
+    parser.add_argument("--ocr-threads", type=int, default=CONFIG.get("ocr_workers", 2),
+                        help="OCR threads for --regions")
+    parser.add_argument("--translator", help="Translator to use as module:Class (default: mock)")
+    parser.add_argument("--translator-latency", type=float, default=80, help="Mock translator latency in ms")
+    parser.add_argument("--json", metavar="PATH", help="Write machine-readable results to PATH ('-' for stdout)")
+    parser.add_argument("--baseline", metavar="PATH", help="Fail if p95 latencies regressed against PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 regression (0.25 = 25%%)")
+    args = parser.parse_args()
+    
+    if args.generate:
+        generate_workloads(args.generate)
+        return 0
+    if not args.workloads:
+        parser.error("give at least one workload directory (or --generate DIR)")
+        
+    # Keep the benchmark independent of whatever is in the on-disk cache
+    CONFIG["cache_db_path"] = None
+    
+    if args.regions:
+        frames = load_frames(args.workloads[0])
+        if not frames:
+            parser.error(f"no frames found in {args.workloads[0]}")
+        counts = [int(n) for n in args.regions.split(',')]
+        print(f"OCR scaling on {os.cpu_count()} CPUs, {args.ocr_processes} processes, {args.ocr_threads} threads:")
+        results = run_scaling(frames, counts, engine_factory(args.ocr, args.ocr_latency, args.ocr_cpu),
+                              args.ocr_processes, args.ocr_threads)
+        if args.json:
+            report = {'python': platform.python_version(), 'cpus': os.cpu_count(), 'scaling': results}
+            if args.json == '-':
+                json.dump(report, sys.stdout, indent=2)
+            else:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2)
+        return 0
+    
+    results = []
+    for directory in args.workloads:
+        frames = load_frames(directory)
+        if not frames:
+            print(f"No frames found in {directory}")
+            continue
+        translator = load_translator(args.translator, args.translator_latency)
+        engine = create_engine(args.ocr, args.ocr_latency, args.ocr_cpu)
+        try:
+            result = run_workload(os.path.basename(os.path.normpath(directory)), frames, translator, engine)
+        finally:
+            engine.close()
+        results.append(result)
+        print_report(result)
+        
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'ocr_backend': args.ocr,
+        'peak_rss_mb': peak_rss_mb(),
+        'workloads': results
+    }
+    print(f"\nPeak RSS: {report['peak_rss_mb']} MB")
+    
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+    elif args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nPerformance regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo performance regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,50 @@
 import customtkinter as ctk
 from tkinter import messagebox, simpledialog
-import pyautogui
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import ImageTk, ImageDraw, ImageFont
 import pytesseract
 import threading
 import time
 import queue
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import json
 import os
-from pynput import keyboard
 import cv2
 import numpy as np
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import hashlib
 import ctypes
 from ctypes import wintypes
 import requests
+from requests.adapters import HTTPAdapter
+import sqlite3
+import bisect
+import functools
+import itertools
+import re
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Set CustomTkinter appearance and theme
 ctk.set_appearance_mode("dark")  # "dark" or "light"
 ctk.set_default_color_theme("blue")  # "blue", "green", or "dark-blue"
 
+# Screen capture and global hotkeys need a desktop session; the processing
+# classes below also work headless (see benchmark.py)
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except Exception:
+    PYAUTOGUI_AVAILABLE = False
+
+try:
+    from pynput import keyboard
+    PYNPUT_AVAILABLE = True
+except Exception:
+    PYNPUT_AVAILABLE = False
+    print("Note: pynput not available. Global hotkeys are disabled.")
+
 # Google Cloud Translation
 try:
     from google.cloud import translate_v2 as translate
@@ -40,11 +64,62 @@ except ImportError:
     print("Note: pywin32 not installed. Overlays may not be fully click-through.")
     print("Install with: pip install pywin32")
 
+# Fast multi-monitor screen capture
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+    print("Note: mss not installed. Falling back to pyautogui for screen capture.")
+    print("Install with: pip install mss")
+
+# In-process Tesseract API
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+    print("Note: tesserocr not installed. OCR will start a tesseract process per frame.")
+    print("Install with: pip install tesserocr")
+
+# Asyncio HTTP client: many translation requests in flight on one event loop
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    print("Note: httpx not installed. Translation requests will be sent one at a time.")
+    print("Install with: pip install httpx")
+
+# Offline translation: Argos Translate models run with CTranslate2
+try:
+    import ctranslate2
+    from argostranslate import package as argos_package
+    OFFLINE_TRANSLATION_AVAILABLE = True
+except ImportError:
+    OFFLINE_TRANSLATION_AVAILABLE = False
+    print("Note: argostranslate not installed. Offline translation will be unavailable.")
+    print("Install with: pip install argostranslate")
+
 # Configuration
 CONFIG = {
     "tesseract_path": r"C:\Program Files\Tesseract-OCR\tesseract.exe",  # Update this path 
     "deepl_api_key": "API_KEY",  # Your DeepL API key
-    "update_interval": 500,  # milliseconds
+    "update_interval": 500,  # milliseconds, fastest polling rate right after a change
+    "max_update_interval": 4000,  # milliseconds, slowest polling rate for static regions
+    "update_backoff": 2.0,  # Interval multiplier while a region stays unchanged
+    "cpu_budget": 0.5,  # Fraction of one core the capture/OCR stages may use
+    "hash_threshold": 3,  # Changed bits (per 64) tolerated before a region counts as changed
+    "large_region_area": 160000,  # Regions at least this many pixels use a 16x16 hash
+    "change_tolerance": 24,  # Gray levels a 4x4 cell may drift before a near-identical frame counts as changed
+    "band_min_gap": 3,  # Blank pixel rows that separate two text line bands
+    "text_detection": True,  # OCR only boxes that look like text instead of whole line bands
+    "text_min_height": 6,  # Pixel height range of a line of text for text detection
+    "text_max_height": 150,
+    "preprocess": "auto",  # Preprocessing steps such as ["gray", "scale", "otsu", "invert"], or "auto" to tune per region
+    "ocr_x_height": 20,  # Pixel x-height the "scale" step resizes text to; Tesseract reads best around 20
+    "preprocess_retune_interval": 60,  # Min seconds between re-tuning a region whose OCR confidence dropped
+    "ocr_cache_size": 4096,  # OCR results kept for revisited frames and line bands
     "cache_size": 1000,
     "default_target_lang": "en",  # English by default, change as needed
     "overlay_bg_color": "#2C3E50",
@@ -52,31 +127,2806 @@ CONFIG = {
     "overlay_opacity": 0.95,
     "font_size": 13,
     "min_confidence": 30,  # Minimum OCR confidence threshold
-    "max_text_length": 5000  # Maximum text length to translate
+    "ocr_backend": "auto",  # "auto", "tesserocr" or "pytesseract"
+    "ocr_lang": "eng",  # Tesseract language(s), e.g. "eng+jpn"
+    "max_text_length": 5000,  # Maximum text length to translate
+    "http_pool_size": 10,  # Keep-alive connections per translation API host
+    "segment_translation": True,  # Translate and cache sentences separately
+    "language_detection": True,  # Identify the source language locally; text already in the target language is not sent
+    "cache_db_path": os.path.join(os.path.expanduser("~"), ".polyglot", "translations.db"),  # Set to None to disable the disk cache
+    "cache_ttl": 30 * 24 * 3600,  # seconds a cached translation stays valid
+    "cache_max_bytes": 64 * 1024 * 1024,  # Size bound of the on-disk cache
+    "fuzzy_threshold": 0.9,  # Reuse a translation for text at least this similar (None to disable)
+    "fuzzy_cache_size": 50000,  # Entries kept in the fuzzy lookup index
+    "usage_ledger_path": os.path.join(os.path.expanduser("~"), ".polyglot", "usage.json"),  # Monthly characters per provider
+    "character_budgets": {"deepl": 500000, "google": None},  # Monthly character limit per provider (None = unlimited)
+    "requests_per_second": 5,  # Sustained translation requests per second
+    "request_burst": 10,  # Requests allowed back to back before rate limiting kicks in
+    "budget_reserve": 0.1,  # Below this share of the quota, busy regions are throttled
+    "budget_low_interval": 30,  # seconds between paid translations of a region once the quota runs low
+    "usage_reconcile_interval": 600,  # seconds between checks of the provider's own usage report
+    "latency_slo": 2.0,  # seconds before a request is hedged to the next provider
+    "breaker_error_rate": 0.5,  # Share of failed or too-slow calls that opens a provider's circuit
+    "breaker_cooldown": 30,  # seconds before an open circuit lets a trial request through
+    "offline_backend": "fallback",  # "primary", "fallback" or None to never translate offline
+    "offline_source_lang": None,  # Source language assumed offline for undetected text (None = send it online)
+    "offline_threads": 4,  # CPU threads per offline translation
+    "offline_batch_size": 32,  # Texts per offline inference batch
+    "ocr_workers": 2,  # Threads running Tesseract
+    "ocr_processes": 0,  # Worker processes for OCR (0 = OCR in the ocr_workers threads)
+    "translate_workers": 2,  # Threads sending translation requests
+    "pipeline_queue_size": 32,  # Max pending items between pipeline stages
+    "batch_window": 50,  # milliseconds to wait for more texts before sending a batch
+    "render_interval": 30,  # milliseconds between overlay updates on the UI thread
+    "overlay_timeout": 10000,  # milliseconds before an unchanged overlay hides itself
+    "metrics_file": None,  # Path to periodically write metrics to (.prom for Prometheus text, else JSON)
+    "metrics_port": None,  # Serve /metrics and /metrics.json on 127.0.0.1:<port>
+    "metrics_interval": 10  # seconds between metrics file writes
 }
 
 # Set Tesseract path if needed
 if os.path.exists(CONFIG["tesseract_path"]):
     pytesseract.pytesseract.tesseract_cmd = CONFIG["tesseract_path"]
 
+class PytesseractEngine:
+    """OCR backend that runs the tesseract executable for every frame"""
+    name = "pytesseract"
+    
+    def __init__(self, lang='eng'):
+        self.lang = lang
+    
+    def image_to_data(self, image):
+        return pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+    
+    def close(self):
+        pass
+
+class TesserocrEngine:
+    """OCR backend that keeps tesseract APIs with loaded models alive between frames"""
+    name = "tesserocr"
+    
+    def __init__(self, lang='eng', tessdata_path=None):
+        self.lang = lang
+        self.tessdata_path = tessdata_path
+        # An API instance is not thread-safe, so each concurrent caller checks one out
+        self.idle = queue.LifoQueue()
+        self.apis = []
+        self.lock = threading.Lock()
+        # Load the models once up front so a broken setup fails here, not mid-session
+        self.idle.put(self._create_api())
+    
+    def _create_api(self):
+        kwargs = {'lang': self.lang}
+        if self.tessdata_path:
+            kwargs['path'] = self.tessdata_path
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        with self.lock:
+            self.apis.append(api)
+        return api
+    
+    def image_to_data(self, image):
+        try:
+            api = self.idle.get_nowait()
+        except queue.Empty:
+            api = self._create_api()
+        try:
+            return self._recognize(api, image)
+        finally:
+            self.idle.put(api)
+    
+    def _recognize(self, api, image):
+        """Recognize a numpy or PIL image, returning pytesseract's dict layout (word rows only)"""
+        img = np.ascontiguousarray(np.asarray(image))
+        height, width = img.shape[:2]
+        bytes_per_pixel = 1 if img.ndim == 2 else img.shape[2]
+        
+        api.SetImageBytes(img.tobytes(), width, height, bytes_per_pixel, img.strides[0])
+        api.Recognize()
+        
+        data = {key: [] for key in (
+            'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+            'left', 'top', 'width', 'height', 'conf', 'text'
+        )}
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+        
+        RIL = tesserocr.RIL
+        block_num = par_num = line_num = word_num = 0
+        for word in tesserocr.iterate_level(iterator, RIL.WORD):
+            if word.IsAtBeginningOf(RIL.BLOCK):
+                block_num += 1
+                par_num = line_num = 0
+            if word.IsAtBeginningOf(RIL.PARA):
+                par_num += 1
+                line_num = 0
+            if word.IsAtBeginningOf(RIL.TEXTLINE):
+                line_num += 1
+                word_num = 0
+            word_num += 1
+            
+            box = word.BoundingBox(RIL.WORD)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            data['level'].append(5)
+            data['page_num'].append(1)
+            data['block_num'].append(block_num)
+            data['par_num'].append(par_num)
+            data['line_num'].append(line_num)
+            data['word_num'].append(word_num)
+            data['left'].append(x1)
+            data['top'].append(y1)
+            data['width'].append(x2 - x1)
+            data['height'].append(y2 - y1)
+            data['conf'].append(int(word.Confidence(RIL.WORD)))
+            data['text'].append(word.GetUTF8Text(RIL.WORD) or '')
+        return data
+    
+    def close(self):
+        with self.lock:
+            for api in self.apis:
+                api.End()
+            self.apis.clear()
+
+def create_ocr_engine():
+    """Pick the configured OCR backend, falling back to pytesseract"""
+    backend = CONFIG.get("ocr_backend", "auto")
+    lang = CONFIG.get("ocr_lang", "eng")
+    
+    if backend in ("auto", "tesserocr") and TESSEROCR_AVAILABLE:
+        # Use the tessdata folder next to the configured executable if there is one
+        tessdata_path = os.path.join(os.path.dirname(CONFIG["tesseract_path"]), "tessdata")
+        if not os.path.isdir(tessdata_path):
+            tessdata_path = None
+        try:
+            engine = TesserocrEngine(lang, tessdata_path)
+            print("Using in-process Tesseract (tesserocr)")
+            return engine
+        except Exception as e:
+            print(f"tesserocr setup failed, falling back to pytesseract: {e}")
+    
+    return PytesseractEngine(lang)
+
+def filter_words(ocr_data, min_confidence):
+    """Confident words of an image_to_data result, with their boxes"""
+    words = []
+    for i in range(len(ocr_data['level'])):
+        conf = int(float(ocr_data['conf'][i]))
+        if conf > min_confidence:
+            text = ocr_data['text'][i].strip()
+            if text and len(text) > 1:  # Skip single characters
+                words.append({
+                    'text': text,
+                    'conf': conf,
+                    'left': ocr_data['left'][i],
+                    'top': ocr_data['top'][i],
+                    'width': ocr_data['width'][i],
+                    'height': ocr_data['height'][i],
+                    'block_num': ocr_data['block_num'][i],
+                    'line_num': ocr_data['line_num'][i]
+                })
+    return words
+
+_process_engine = None
+
+def _init_ocr_process(engine_factory, config):
+    """Process pool initializer: each worker process keeps its own engine loaded"""
+    global _process_engine
+    CONFIG.update(config)
+    _process_engine = engine_factory()
+
+def _read_words_in_process(image, min_confidence):
+    return filter_words(_process_engine.image_to_data(image), min_confidence)
+
+class OCRProcessPool:
+    """Runs OCR and confidence filtering in worker processes, one engine per process
+    
+    Tesseract and the Python around it then use as many cores as there are
+    workers instead of sharing one interpreter lock.
+    """
+    def __init__(self, workers, engine_factory=None):
+        self.workers = workers
+        # Settings the engine reads, in case the parent changed them at runtime
+        config = {key: CONFIG[key] for key in ("ocr_backend", "ocr_lang", "tesseract_path") if key in CONFIG}
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_ocr_process,
+            initargs=(engine_factory or create_ocr_engine, config)
+        )
+    
+    def read_words(self, image, min_confidence=None):
+        if min_confidence is None:
+            min_confidence = CONFIG.get('min_confidence', 30)
+        return self.executor.submit(_read_words_in_process, image, min_confidence).result()
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Shared keep-alive session with a connection pool for all HTTP translation clients"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=CONFIG.get("http_pool_size", 10))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['Accept-Encoding'] = 'gzip, deflate'
+            _http_session = session
+        return _http_session
+
+_async_loop = None
+_async_client = None
+
+def get_event_loop():
+    """Background event loop shared by all async translation requests"""
+    global _async_loop
+    with _http_session_lock:
+        if _async_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True, name="translate-io").start()
+            _async_loop = loop
+        return _async_loop
+
+def run_async(coro, timeout=None):
+    """Run a coroutine on the shared loop and wait for its result from any thread"""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result(timeout)
+
+def get_async_client():
+    """Shared pooled httpx client; only use it from the shared event loop"""
+    global _async_client
+    if _async_client is None:
+        size = CONFIG.get("http_pool_size", 10)
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size)
+        )
+    return _async_client
+
+def box_overlap(a, b):
+    """Intersection area of two (left, top, right, bottom) boxes"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return width * height if width > 0 and height > 0 else 0
+
+def create_region_data(region_id, bounds):
+    """Create the state dict that tracks one monitored region"""
+    # Big regions get a finer hash so small text changes still register
+    area = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
+    hash_size = 16 if area >= CONFIG.get("large_region_area", 160000) else 8
+    
+    return {
+        'id': region_id,
+        'bounds': bounds,
+        'last_blocks': [],
+        'last_translation': '',
+        # Overlay key -> (block box, translation) of the blocks on screen
+        'overlays': {},
+        # Keys of hidden windows that new blocks reuse before creating one
+        'spare_overlays': [],
+        'hash_size': hash_size,
+        'hash_threshold': CONFIG.get("hash_threshold", 3) * (hash_size // 8) ** 2,
+        'preprocess': CONFIG.get("preprocess", "auto")
+    }
+
+# Segment boundaries: whitespace after Latin end punctuation, right after CJK end punctuation,
+# or a line break between the lines of a text block
+SEGMENT_BOUNDARY = re.compile(r'((?<=[.!?])\s+|(?<=[。！？])|\s*\n\s*)')
+
+def split_segments(text):
+    """Split text into sentences or lines and the separators between them
+    
+    Returns [segment, separator, segment, ...] so ''.join() restores the text.
+    """
+    return SEGMENT_BOUNDARY.split(text)
+
+def needs_translation(text):
+    """Skip text that is too short or just numbers"""
+    return len(text) >= 2 and not text.isdigit()
+
+# Unicode blocks of scripts that (nearly) identify a language on their own, and of some shared ones
+SCRIPT_RANGES = (
+    (0x0370, 0x03FF, 'el'),
+    (0x0400, 0x04FF, 'cyrillic'),
+    (0x0590, 0x05FF, 'he'),
+    (0x0600, 0x06FF, 'arabic'),
+    (0x0900, 0x097F, 'devanagari'),
+    (0x0E00, 0x0E7F, 'th'),
+    (0x1100, 0x11FF, 'ko'),
+    (0x3040, 0x30FF, 'kana'),
+    (0x3130, 0x318F, 'ko'),
+    (0x31F0, 0x31FF, 'kana'),
+    (0x3400, 0x4DBF, 'han'),
+    (0x4E00, 0x9FFF, 'han'),
+    (0xAC00, 0xD7AF, 'ko'),
+    (0xF900, 0xFAFF, 'han'),
+    (0xFF66, 0xFF9F, 'kana'),
+)
+SCRIPT_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+# Written in several languages (Russian, Ukrainian, Serbian...; Hindi, Marathi, Nepali...), so never decisive
+SHARED_SCRIPTS = frozenset(('cyrillic', 'arabic', 'devanagari'))
+PUNCTUATION = '.,;:!?¿¡"\'()[]«»“”‘’…-'
+
+# Frequent words, including common UI labels, of the Latin-script languages the app offers
+LANGUAGE_WORDS = {
+    'en': frozenset('''the be to of and in that have it for not on with he as you do at this but his by from
+        they we say her she or an will my one all would there their what so up out if about who get which
+        go me when make can like time no just him know take is are was were been has had your our please
+        click file edit view help settings options tools window open save close new cancel ok yes exit
+        quit search home back next start stop play pause loading menu select delete copy paste undo redo
+        print share send update download upload login sign account profile language message continue done
+        error warning'''.split()),
+    'es': frozenset('''el la los las de del que en un una es por con para no se su al lo como más pero sus
+        le ya este sí porque esta entre cuando muy sin sobre también me hasta hay donde quien desde todo
+        nos durante todos uno les ni contra otros ese eso ante ellos esto antes algunos qué unos yo otro
+        otras otra él tanto esa estos mucho nada muchos cual poco ella estar estas algo archivo editar ver
+        ayuda configuración ventana abrir guardar cerrar nuevo cancelar aceptar salir buscar inicio
+        siguiente atrás'''.split()),
+    'fr': frozenset('''le la les de des du un une et est en que qui dans pour pas sur ce il elle ne se plus
+        par avec au aux son sa ses nous vous ils on mais ou où comme cette été être avoir je tu fichier
+        édition affichage aide paramètres fenêtre ouvrir enregistrer fermer nouveau annuler quitter
+        rechercher accueil suivant précédent oui non'''.split()),
+    'de': frozenset('''der die das und ist nicht ein eine zu den von mit sich des auf für im dem es auch als
+        an er sie so wir ich du wie aber oder wenn noch bei nach aus um nur werden wird sind war hat haben
+        kann datei bearbeiten ansicht hilfe einstellungen fenster öffnen speichern schließen neu abbrechen
+        beenden suchen weiter zurück ja nein'''.split()),
+    'it': frozenset('''il lo la gli le di del della che un una per non in con su da si sono come ma anche
+        più questo questa stato stata essere ha hanno era molto perché cosa dove quando tutto al alla nel
+        nella ci se mi ti io tu lui lei noi voi loro modifica visualizza aiuto impostazioni finestra apri
+        salva chiudi nuovo annulla esci cerca avanti indietro sì'''.split()),
+    'pt': frozenset('''os as de do da dos das que um uma em no na nos nas para por com não se mais
+        como mas ao seu sua ele ela eu você isso este esta arquivo editar exibir ajuda configurações janela
+        abrir salvar fechar novo cancelar sair pesquisar próximo voltar sim'''.split()),
+}
+# Letters that only some of those languages use
+LANGUAGE_LETTERS = {
+    'ñ': ('es',), '¿': ('es',), '¡': ('es',), 'ß': ('de',), 'ä': ('de',), 'ö': ('de',), 'ü': ('de',),
+    'ã': ('pt',), 'õ': ('pt',), 'ç': ('fr', 'pt'), 'è': ('fr', 'it'), 'ê': ('fr', 'pt'), 'œ': ('fr',),
+    'ì': ('it',), 'ò': ('it',),
+}
+
+@functools.lru_cache(maxsize=8192)
+def detect_language(text):
+    """Identify the language of text locally, or None unless it is clear
+    
+    A result is both shown untranslated when it matches the target language
+    and passed to providers as the source, so anything doubtful is None and
+    left to the provider. Scripts that belong to one language decide on their
+    own, scripts shared by several never do. Latin text needs at least two
+    frequent words of one language making up most of its words, and a clear
+    lead over the next language; Han without kana is only taken for Chinese
+    in longer text, as short strings may be Japanese.
+    """
+    counts = {}
+    if not text.isascii():
+        for char in text:
+            if char.isalpha() and ord(char) >= 0x370:
+                index = bisect.bisect_right(SCRIPT_STARTS, ord(char)) - 1
+                if index >= 0 and ord(char) <= SCRIPT_RANGES[index][1]:
+                    script = SCRIPT_RANGES[index][2]
+                    counts[script] = counts.get(script, 0) + 1
+    if counts:
+        script = max(counts, key=counts.get)
+        if counts.get('kana'):
+            return 'ja'
+        if script == 'han':
+            return 'zh' if counts['han'] >= 8 else None
+        if script in SHARED_SCRIPTS:
+            return None
+        return script
+    
+    # Whole words only: OCR noise such as "w1a2" must not read as stopwords
+    lowered = text.lower()
+    words = [word for word in (token.strip(PUNCTUATION) for token in lowered.split()) if len(word) > 1 and word.isalpha()]
+    if len(words) < 2:
+        return None
+    matches = {lang: sum(word in vocabulary for word in words) for lang, vocabulary in LANGUAGE_WORDS.items()}
+    scores = dict(matches)
+    if not text.isascii():
+        for char, langs in LANGUAGE_LETTERS.items():
+            if char in lowered:
+                for lang in langs:
+                    scores[lang] += 2
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    best, runner_up = ranked[0], ranked[1]
+    if matches[best] >= 2 and matches[best] > len(words) / 2 and scores[best] >= scores[runner_up] + 2:
+        return best
+    return None
+
+def is_target_language(lang, target_lang):
+    """Detected language is the target one; Chinese variants still need converting"""
+    return lang is not None and lang != 'zh' and lang == target_lang.lower().split('-')[0]
+
+def hamming_distance(hash_a, hash_b):
+    """Number of differing bits between two packed integer hashes"""
+    return bin(hash_a ^ hash_b).count('1')
+
+def chunk_texts(texts, max_items, max_chars):
+    """Split texts into batches that respect a provider's request limits"""
+    batch = []
+    batch_chars = 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or batch_chars + len(text) > max_chars):
+            yield batch
+            batch = []
+            batch_chars = 0
+        batch.append(text)
+        batch_chars += len(text)
+    if batch:
+        yield batch
+
+class PersistentTranslationStore:
+    """SQLite-backed translation store used as the second cache tier"""
+    def __init__(self, db_path, ttl=None, max_bytes=None):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.conn = None
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+    
+    def _connect(self):
+        """Open the database on first use"""
+        if self.conn is not None:
+            return self.conn
+        
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, translation TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL, accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_accessed ON translations (accessed)")
+        
+        # Drop anything that expired while the application was closed
+        self.conn.execute("DELETE FROM translations WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        self.conn.commit()
+        
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()
+        self.total_bytes = row[0]
+        return self.conn
+    
+    def get(self, key):
+        """Return (translation, expires) for key or None"""
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT translation, expires FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            translation, expires = row
+            if expires is not None and expires <= now:
+                self._delete(conn, key)
+                conn.commit()
+                return None
+            
+            conn.execute("UPDATE translations SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return translation, expires
+    
+    def put(self, key, translation):
+        """Store a translation and return its expiry time"""
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        size = len(key.encode('utf-8')) + len(translation.encode('utf-8'))
+        
+        with self.lock:
+            conn = self._connect()
+            self._delete(conn, key)
+            conn.execute(
+                "INSERT INTO translations (key, translation, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, translation, size, expires, now)
+            )
+            self.total_bytes += size
+            
+            if self.max_bytes and self.total_bytes > self.max_bytes:
+                self._evict(conn)
+            
+            conn.commit()
+        return expires
+    
+    def load_recent(self, limit):
+        """Return the most recently used entries as (key, translation, expires) tuples"""
+        with self.lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT key, translation, expires FROM translations "
+                "WHERE expires IS NULL OR expires > ? ORDER BY accessed DESC LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        # Oldest first so the hottest entries end up at the LRU tail
+        return list(reversed(rows))
+    
+    def _delete(self, conn, key):
+        row = conn.execute("SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+        if row:
+            conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+            self.total_bytes -= row[0]
+    
+    def _evict(self, conn):
+        """Evict expired, then least recently used entries until under the size bound"""
+        conn.execute("DELETE FROM translations WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        self.total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        
+        # Leave some headroom so we don't evict on every insert
+        target = int(self.max_bytes * 0.9)
+        if self.total_bytes <= target:
+            return
+        
+        victims = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM translations ORDER BY accessed ASC"):
+            victims.append((key,))
+            freed += size
+            if self.total_bytes - freed <= target:
+                break
+        conn.executemany("DELETE FROM translations WHERE key = ?", victims)
+        self.total_bytes -= freed
+    
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+# Characters Tesseract commonly confuses, folded together before fuzzy matching
+OCR_CONFUSABLES = str.maketrans({'I': 'l', '|': 'l', '¦': 'l'})
+NON_WORD = re.compile(r'[^\w\s]')
+DIGITS = re.compile(r'\d+')
+
+def normalize_ocr_text(text):
+    """Fold case, width, confusable letters, punctuation and spacing"""
+    text = unicodedata.normalize('NFKC', text).translate(OCR_CONFUSABLES).lower()
+    return ' '.join(NON_WORD.sub(' ', text).split())
+
+@functools.lru_cache(maxsize=4096)
+def segment_bounds(length, parts):
+    """Start and length of each of the parts an even split of length produces"""
+    size, extra = divmod(length, parts)
+    bounds = []
+    start = 0
+    for i in range(parts):
+        part = size + (1 if i >= parts - extra else 0)
+        bounds.append((start, part))
+        start += part
+    return tuple(bounds)
+
+def bounded_edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit"""
+    # Shared prefixes and suffixes never add to the distance
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < len(a) - prefix and suffix < len(b) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    a, b = a[prefix:len(a) - suffix], b[prefix:len(b) - suffix]
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    big = limit + 1
+    previous = [j if j <= limit else big for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        # Only cells within limit of the diagonal can stay below the limit
+        lo = max(1, i - limit)
+        hi = min(len(b), i + limit)
+        current = [big] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        char = a[i - 1]
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (char != b[j - 1])
+            if previous[j] < cost:
+                cost = previous[j] + 1
+            if current[j - 1] < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost if cost < big else big
+        if min(current[lo - 1:hi + 1]) > limit:
+            return big
+        previous = current
+    return previous[len(b)]
+
+class FuzzyTranslationIndex:
+    """Finds stored translations for text within a few OCR errors of it
+    
+    Each stored text that tolerates k edits is split into k + 1 segments; a
+    text within k edits must contain one of them unchanged near its original
+    position, so a lookup only probes a handful of substrings. Segments shared
+    by many texts (common words of repetitive UI text) say little and are not
+    indexed, and a lookup checks at most max_checks candidates, those sharing
+    the most segments first.
+    
+    Buckets are immutable tuples replaced on write, so lookups read them
+    without taking the lock.
+    """
+    max_bucket = 32
+    max_checks = 8
+    
+    def __init__(self, threshold=0.9, max_entries=50000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (source, target, normalized) -> (translation, expires)
+        self.segments = {}  # (source, target, length, part, segment) -> normalized texts, None once too common
+        self.lock = threading.Lock()
+    
+    def _max_edits(self, length):
+        return int(length * (1 - self.threshold) + 1e-9)
+    
+    def _segment_keys(self, source_lang, target_lang, norm):
+        parts = self._max_edits(len(norm)) + 1
+        if parts == 1:
+            return []  # Short texts only match exactly after normalization
+        return [
+            (source_lang, target_lang, len(norm), i, norm[start:start + size])
+            for i, (start, size) in enumerate(segment_bounds(len(norm), parts))
+        ]
+    
+    def add(self, text, translation, source_lang, target_lang, expires=None):
+        norm = normalize_ocr_text(text)
+        if not norm:
+            return
+        key = (source_lang, target_lang, norm)
+        with self.lock:
+            if key not in self.entries:
+                for segment_key in self._segment_keys(source_lang, target_lang, norm):
+                    texts = self.segments.get(segment_key, ())
+                    if texts is not None:
+                        # A segment that stays too common is dropped for good
+                        self.segments[segment_key] = texts + (norm,) if len(texts) < self.max_bucket else None
+            self.entries[key] = (translation, expires)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+    
+    def _remove(self, key):
+        source_lang, target_lang, norm = key
+        del self.entries[key]
+        for segment_key in self._segment_keys(source_lang, target_lang, norm):
+            texts = self.segments.get(segment_key)
+            if texts and norm in texts:
+                texts = tuple(text for text in texts if text != norm)
+                if texts:
+                    self.segments[segment_key] = texts
+                else:
+                    del self.segments[segment_key]
+    
+    def _candidates(self, norm, other, source_lang, target_lang):
+        """Stored texts of length other sharing a segment with norm, by number of shared segments"""
+        length = len(norm)
+        edits = self._max_edits(other)
+        delta = length - other
+        counts = {}
+        if edits == 0 or abs(delta) > edits:
+            return []
+        for i, (start, size) in enumerate(segment_bounds(other, edits + 1)):
+            # Edits before segment i shift it by at most i, edits after it by at most edits - i
+            first = max(start - i, start + delta - (edits - i), 0)
+            last = min(start + i, start + delta + (edits - i), length - size)
+            for offset in range(first, last + 1):
+                texts = self.segments.get((source_lang, target_lang, other, i, norm[offset:offset + size]))
+                if texts:
+                    for text in texts:
+                        counts[text] = counts.get(text, 0) + 1
+        return sorted(counts, key=counts.get, reverse=True)
+    
+    def lookup(self, text, source_lang, target_lang):
+        """Return the translation of the closest stored text within the threshold"""
+        norm = normalize_ocr_text(text)
+        if not norm:
+            return None
+        now = time.time()
+        entry = self.entries.get((source_lang, target_lang, norm))
+        if entry and (entry[1] is None or entry[1] > now):
+            return entry[0]
+        
+        length = len(norm)
+        digits = DIGITS.findall(norm)
+        best, best_distance = None, None
+        checks = self.max_checks
+        # Closest lengths first: the length difference alone is a lower bound on the distance
+        others = sorted(
+            range(int(length * self.threshold), int(length / self.threshold) + 1),
+            key=lambda other: abs(other - length)
+        )
+        for other in others:
+            if best_distance is not None and abs(other - length) >= best_distance:
+                break
+            for candidate in self._candidates(norm, other, source_lang, target_lang):
+                if checks == 0:
+                    return best
+                entry = self.entries.get((source_lang, target_lang, candidate))
+                # Numbers must match exactly: "Level 12" is not "Level 13"
+                if entry is None or (entry[1] is not None and entry[1] <= now) or DIGITS.findall(candidate) != digits:
+                    continue
+                checks -= 1
+                limit = self._max_edits(other)
+                if best_distance is not None:
+                    limit = min(limit, best_distance - 1)
+                distance = bounded_edit_distance(norm, candidate, limit)
+                if distance <= limit:
+                    best, best_distance = entry[0], distance
+                    if distance <= 1:
+                        return best  # Nothing closer short of the exact match already ruled out
+        return best
+
 class TranslationCache:
-    """LRU cache for translations"""
-    def __init__(self, max_size=1000):
+    """LRU cache for translations with an optional persistent tier"""
+    def __init__(self, max_size=1000, db_path=None, ttl=None, max_bytes=None,
+                 fuzzy_threshold=None, fuzzy_size=50000):
         self.cache = OrderedDict()
         self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.store = None
+        if db_path:
+            self.store = PersistentTranslationStore(db_path, ttl, max_bytes)
+        self.fuzzy = None
+        if fuzzy_threshold:
+            self.fuzzy = FuzzyTranslationIndex(fuzzy_threshold, fuzzy_size)
+    
+    def _key(self, text, source_lang, target_lang):
+        return f"{text}_{source_lang}_{target_lang}"
+    
+    def _remember(self, key, translation, expires):
+        self.cache[key] = (translation, expires)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
     
     def get(self, text, source_lang, target_lang):
-        key = f"{text}_{source_lang}_{target_lang}"
-        if key in self.cache:
-            self.cache.move_to_end(key)
-            return self.cache[key]
+        key = self._key(text, source_lang, target_lang)
+        with self.lock:
+            if key in self.cache:
+                translation, expires = self.cache[key]
+                if expires is None or expires > time.time():
+                    self.cache.move_to_end(key)
+                    return translation
+                del self.cache[key]
+        
+        if self.store:
+            try:
+                entry = self.store.get(key)
+            except sqlite3.Error as e:
+                print(f"Translation cache read error: {e}")
+                return None
+            if entry:
+                translation, expires = entry
+                with self.lock:
+                    self._remember(key, translation, expires)
+                return translation
         return None
     
     def put(self, text, translation, source_lang, target_lang):
-        key = f"{text}_{source_lang}_{target_lang}"
-        self.cache[key] = translation
-        if len(self.cache) > self.max_size:
-            self.cache.popitem(last=False)
+        key = self._key(text, source_lang, target_lang)
+        expires = time.time() + self.ttl if self.ttl else None
+        if self.store:
+            try:
+                expires = self.store.put(key, translation)
+            except sqlite3.Error as e:
+                print(f"Translation cache write error: {e}")
+        with self.lock:
+            self._remember(key, translation, expires)
+        if self.fuzzy:
+            self.fuzzy.add(text, translation, source_lang, target_lang, expires)
+    
+    def get_similar(self, text, source_lang, target_lang):
+        """Fuzzy lookup for text that differs from a cached entry by OCR noise"""
+        if not self.fuzzy:
+            return None
+        return self.fuzzy.lookup(text, source_lang, target_lang)
+    
+    def warm(self):
+        """Preload the most recently used translations from disk"""
+        if not self.store:
+            return
+        try:
+            entries = self.store.load_recent(self.max_size)
+        except sqlite3.Error as e:
+            print(f"Translation cache warm-up failed: {e}")
+            return
+        with self.lock:
+            for key, translation, expires in entries:
+                if key not in self.cache:
+                    self._remember(key, translation, expires)
+        if self.fuzzy:
+            for key, translation, expires in entries:
+                text, source_lang, target_lang = key.rsplit('_', 2)
+                self.fuzzy.add(text, translation, source_lang, target_lang, expires)
+    
+    def close(self):
+        if self.store:
+            self.store.close()
+
+class ScreenCapture:
+    """Grabs all regions with one screen capture and hands out numpy views"""
+    def __init__(self):
+        self.buffer = None
+        self.local = threading.local()
+        self.grab_time = 0.0
+    
+    def grab(self, bounds_list):
+        """Capture the bounding box of all bounds once and return a view per bounds
+        
+        The views share the capture buffer, which is reused by the next grab.
+        """
+        if not bounds_list:
+            return []
+        
+        start = time.perf_counter()
+        left = min(b[0] for b in bounds_list)
+        top = min(b[1] for b in bounds_list)
+        width = max(b[2] for b in bounds_list) - left
+        height = max(b[3] for b in bounds_list) - top
+        
+        if MSS_AVAILABLE:
+            # mss handles are bound to the thread that created them
+            sct = getattr(self.local, 'sct', None)
+            if sct is None:
+                sct = self.local.sct = mss.mss()
+            shot = sct.grab({'left': left, 'top': top, 'width': width, 'height': height})
+            raw = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+            if self.buffer is None or self.buffer.shape != (shot.height, shot.width, 3):
+                self.buffer = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+            cv2.cvtColor(raw, cv2.COLOR_BGRA2RGB, dst=self.buffer)
+        elif PYAUTOGUI_AVAILABLE:
+            self.buffer = np.asarray(pyautogui.screenshot(region=(left, top, width, height)))
+        else:
+            raise RuntimeError("No screen capture backend available. Install mss or pyautogui")
+        
+        elapsed = time.perf_counter() - start
+        self.grab_time = elapsed if not self.grab_time else 0.8 * self.grab_time + 0.2 * elapsed
+        
+        return [self.buffer[y1-top:y2-top, x1-left:x2-left] for x1, y1, x2, y2 in bounds_list]
+
+class LatencyHistogram:
+    """Cumulative latency histogram plus a window of recent samples for percentiles"""
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=1024)
+    
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+    
+    def percentile(self, pct):
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+class Metrics:
+    """Per-stage and per-region latency histograms plus counters"""
+    def __init__(self):
+        self.stages = {}
+        self.region_stages = {}
+        self.counters = {}
+        self.gauges = {}
+        self.started = time.time()
+        self.lock = threading.Lock()
+    
+    def record(self, stage, seconds, region_id=None):
+        with self.lock:
+            self.stages.setdefault(stage, LatencyHistogram()).observe(seconds)
+            if region_id is not None:
+                self.region_stages.setdefault((stage, region_id), LatencyHistogram()).observe(seconds)
+    
+    def increment(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def register_gauge(self, name, callback):
+        """Report the value of callback() whenever metrics are read"""
+        self.gauges[name] = callback
+    
+    def forget_region(self, region_id):
+        with self.lock:
+            for key in [key for key in self.region_stages if key[1] == region_id]:
+                del self.region_stages[key]
+    
+    def _gauge_values(self):
+        values = {}
+        for name, callback in list(self.gauges.items()):
+            try:
+                values[name] = callback()
+            except Exception:
+                pass
+        return values
+    
+    def _summary(self, histogram):
+        return {
+            'count': histogram.count,
+            'mean_ms': round(histogram.sum / histogram.count * 1000, 3) if histogram.count else 0.0,
+            'p50_ms': round(histogram.percentile(50) * 1000, 3),
+            'p95_ms': round(histogram.percentile(95) * 1000, 3),
+            'p99_ms': round(histogram.percentile(99) * 1000, 3)
+        }
+    
+    def snapshot(self):
+        """All metrics as a JSON-serialisable dict"""
+        gauges = self._gauge_values()
+        with self.lock:
+            regions = {}
+            for (stage, region_id), histogram in self.region_stages.items():
+                regions.setdefault(str(region_id), {})[stage] = self._summary(histogram)
+            return {
+                'timestamp': time.time(),
+                'uptime_s': round(time.time() - self.started, 1),
+                'stages': {stage: self._summary(h) for stage, h in self.stages.items()},
+                'regions': regions,
+                'counters': dict(self.counters),
+                'gauges': gauges
+            }
+    
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        gauges = self._gauge_values()
+        lines = []
+        
+        def histogram_lines(name, labels, histogram):
+            cumulative = 0
+            for bound, count in zip(LatencyHistogram.BUCKETS + (float('inf'),), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        
+        with self.lock:
+            lines.append('# TYPE polyglot_stage_seconds histogram')
+            for stage, histogram in sorted(self.stages.items()):
+                histogram_lines('polyglot_stage_seconds', f'stage="{stage}"', histogram)
+            lines.append('# TYPE polyglot_region_stage_seconds histogram')
+            for (stage, region_id), histogram in sorted(self.region_stages.items()):
+                histogram_lines('polyglot_region_stage_seconds', f'stage="{stage}",region="{region_id}"', histogram)
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE polyglot_{name}_total counter')
+                lines.append(f'polyglot_{name}_total {value}')
+        for name, value in sorted(gauges.items()):
+            # No value (e.g. no character limit) is no sample; the format has no None
+            if value is None:
+                continue
+            lines.append(f'# TYPE polyglot_{name} gauge')
+            lines.append(f'polyglot_{name} {int(value) if isinstance(value, bool) else value}')
+        return '\n'.join(lines) + '\n'
+    
+    def live_summary(self):
+        """Short text for the status area of the control panel"""
+        with self.lock:
+            latencies = ' · '.join(
+                f"{stage} {self.stages[stage].percentile(95) * 1000:.0f}ms"
+                for stage in ('capture', 'ocr', 'translate', 'render') if stage in self.stages
+            )
+            hits = self.counters.get('translation_cache_hits', 0)
+            misses = self.counters.get('translation_cache_misses', 0)
+            ratio = hits / (hits + misses) if hits + misses else 0.0
+            counts = (
+                f"cache {ratio:.0%} · {self.counters.get('api_calls', 0)} API calls "
+                f"({self.counters.get('coalesced_calls', 0)} saved) · "
+                f"{self.counters.get('characters_sent', 0):,} chars · "
+                f"{self.counters.get('frames_skipped', 0)} skipped"
+            )
+        return f"p95 {latencies}\n{counts}" if latencies else counts
+
+class MetricsExporter:
+    """Writes metrics to a file and/or serves them on a local HTTP endpoint"""
+    def __init__(self, metrics, path=None, port=None, interval=10):
+        self.metrics = metrics
+        self.path = path
+        self.port = port
+        self.interval = interval
+        self.server = None
+        self.stop_event = threading.Event()
+    
+    def start(self):
+        if self.path:
+            threading.Thread(target=self._write_loop, daemon=True).start()
+        if self.port:
+            metrics = self.metrics
+            
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path == '/metrics':
+                        body = metrics.to_prometheus().encode('utf-8')
+                        content_type = 'text/plain; version=0.0.4'
+                    elif self.path == '/metrics.json':
+                        body = json.dumps(metrics.snapshot()).encode('utf-8')
+                        content_type = 'application/json'
+                    else:
+                        self.send_error(404)
+                        return
+                    self.send_response(200)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                
+                def log_message(self, format, *args):
+                    pass  # Keep scrapes out of the console
+            
+            try:
+                self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+                threading.Thread(target=self.server.serve_forever, daemon=True).start()
+                print(f"Serving metrics on http://127.0.0.1:{self.port}/metrics")
+            except OSError as e:
+                print(f"Could not start metrics endpoint: {e}")
+    
+    def write(self):
+        if self.path.endswith('.prom'):
+            content = self.metrics.to_prometheus()
+        else:
+            content = json.dumps(self.metrics.snapshot(), indent=2)
+        # Write atomically so a reader never sees a half-written file
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, self.path)
+    
+    def _write_loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Could not write metrics: {e}")
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.path:
+            try:
+                self.write()
+            except OSError:
+                pass
+        if self.server:
+            self.server.shutdown()
+
+class StageQueue:
+    """Bounded queue between pipeline stages that keeps only the newest item per region"""
+    def __init__(self, maxsize):
+        self.items = OrderedDict()
+        self.active = set()
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.closed = False
+        self.cond = threading.Condition()
+    
+    def put(self, key, item):
+        """Queue an item, replacing any stale one for the same key"""
+        with self.cond:
+            if self.closed:
+                return
+            if key in self.items:
+                del self.items[key]
+                self.dropped += 1
+            elif len(self.items) >= self.maxsize:
+                # Full - drop the oldest pending item instead of blocking the producer
+                self.items.popitem(last=False)
+                self.dropped += 1
+            self.items[key] = item
+            self.cond.notify_all()
+    
+    def _ready_count(self):
+        return sum(1 for key in self.items if key not in self.active)
+    
+    def get_many(self, max_items, window=0, timeout=None):
+        """Take up to max_items, waiting up to window seconds for more to arrive
+        
+        Keys handed out stay reserved until task_done, so a region is never
+        processed by two workers of the same stage at once.
+        """
+        with self.cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self.closed and not self._ready_count():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self.cond.wait(remaining)
+            
+            if window:
+                window_end = time.monotonic() + window
+                while not self.closed and self._ready_count() < max_items:
+                    remaining = window_end - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+            
+            if self.closed:
+                return []
+            
+            batch = []
+            for key in list(self.items):
+                if key in self.active:
+                    continue
+                batch.append((key, self.items.pop(key)))
+                self.active.add(key)
+                if len(batch) >= max_items:
+                    break
+            return batch
+    
+    def get(self, timeout=None):
+        batch = self.get_many(1, timeout=timeout)
+        return batch[0] if batch else None
+    
+    def task_done(self, key):
+        with self.cond:
+            self.active.discard(key)
+            self.cond.notify_all()
+    
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.items.clear()
+            self.cond.notify_all()
+
+class AdaptiveScheduler:
+    """Per-region polling schedule that backs off while content is stable"""
+    def __init__(self, min_interval, max_interval, backoff=2.0, cpu_budget=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.entries = {}
+        self.lock = threading.Lock()
+    
+    def sync(self, region_ids):
+        """Track new regions (due immediately) and forget removed ones"""
+        now = time.monotonic()
+        with self.lock:
+            for region_id in region_ids:
+                if region_id not in self.entries:
+                    self.entries[region_id] = {
+                        'interval': self.min_interval,
+                        'next_due': now,
+                        'cost': 0.0,
+                        'pending_cost': 0.0,
+                        'polls': deque()
+                    }
+            for region_id in list(self.entries):
+                if region_id not in region_ids:
+                    del self.entries[region_id]
+    
+    def due(self, now=None):
+        """Return the ids of regions that should be polled now"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            return [region_id for region_id, entry in self.entries.items() if entry['next_due'] <= now]
+    
+    def time_until_next(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            if not self.entries:
+                return self.min_interval
+            return max(0.0, min(entry['next_due'] for entry in self.entries.values()) - now)
+    
+    def record_poll(self, region_id, changed, cost):
+        """Update a region's interval after a poll that took cost seconds"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(region_id)
+            if entry is None:
+                return
+            
+            # Smoothed CPU seconds spent per poll, including OCR work caused by the last change
+            cost += entry['pending_cost']
+            entry['pending_cost'] = 0.0
+            entry['cost'] = cost if not entry['cost'] else 0.8 * entry['cost'] + 0.2 * cost
+            
+            if changed:
+                entry['interval'] = self.min_interval
+            else:
+                entry['interval'] = min(entry['interval'] * self.backoff, self.max_interval)
+            
+            entry['next_due'] = now + entry['interval'] * self._budget_scale()
+            
+            entry['polls'].append(now)
+            while entry['polls'] and entry['polls'][0] < now - 10.0:
+                entry['polls'].popleft()
+    
+    def record_work(self, region_id, cost):
+        """Charge extra work (e.g. OCR) to a region's next poll"""
+        with self.lock:
+            entry = self.entries.get(region_id)
+            if entry is not None:
+                entry['pending_cost'] += cost
+    
+    def _budget_scale(self):
+        """Factor that stretches all intervals when the total load exceeds the CPU budget"""
+        if not self.cpu_budget:
+            return 1.0
+        load = sum(entry['cost'] / entry['interval'] for entry in self.entries.values())
+        return max(1.0, load / self.cpu_budget)
+    
+    def rate(self, region_id):
+        """Effective polls per second of a region over the last few seconds"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(region_id)
+            if entry is None:
+                return 0.0
+            polls = [t for t in entry['polls'] if t >= now - 10.0]
+            if len(polls) < 2:
+                return 1.0 / (entry['interval'] * self._budget_scale())
+            return (len(polls) - 1) / max(polls[-1] - polls[0], 1e-3)
+
+class TranslationPipeline:
+    """Capture -> OCR -> translate -> render stages connected by bounded queues"""
+    def __init__(self, app):
+        self.app = app
+        queue_size = CONFIG.get("pipeline_queue_size", 32)
+        self.ocr_queue = StageQueue(queue_size)
+        self.translate_queue = StageQueue(queue_size)
+        self.render_queue = StageQueue(queue_size)
+        self.wake_event = threading.Event()
+        self.scheduler = AdaptiveScheduler(
+            CONFIG["update_interval"] / 1000.0,
+            CONFIG.get("max_update_interval", CONFIG["update_interval"]) / 1000.0,
+            backoff=CONFIG.get("update_backoff", 2.0),
+            cpu_budget=CONFIG.get("cpu_budget")
+        )
+        self.running = False
+        self.threads = []
+    
+    def start(self):
+        self.running = True
+        # Rendering has no thread of its own: Tk is drained from the UI thread
+        workers = [(self._capture_loop, 1)]
+        # Each thread waits on one OCR process at a time, so keep at least one per process
+        workers.append((self._ocr_worker, max(CONFIG.get("ocr_workers", 2), CONFIG.get("ocr_processes", 0))))
+        workers.append((self._translate_worker, CONFIG.get("translate_workers", 2)))
+        for target, count in workers:
+            for _ in range(max(1, count)):
+                thread = threading.Thread(target=target, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+    
+    def stop(self):
+        self.running = False
+        self.wake_event.set()
+        for stage_queue in (self.ocr_queue, self.translate_queue, self.render_queue):
+            stage_queue.close()
+    
+    def wake(self):
+        """Run the next capture pass immediately"""
+        self.wake_event.set()
+    
+    @property
+    def dropped_frames(self):
+        return self.ocr_queue.dropped + self.translate_queue.dropped + self.render_queue.dropped
+    
+    def _capture_loop(self):
+        while self.running:
+            regions = {region['id']: region for region in list(self.app.monitoring_regions)}
+            self.scheduler.sync(set(regions))
+            
+            due = [regions[region_id] for region_id in self.scheduler.due()]
+            if due:
+                start = time.perf_counter()
+                try:
+                    views = self.app.capture_regions(due)
+                except Exception as e:
+                    print(f"Error capturing regions: {e}")
+                    views = [None] * len(due)
+                # Share the cost of the single grab between the regions it served
+                grab_time = time.perf_counter() - start
+                self.app.metrics.record('capture', grab_time)
+                grab_cost = grab_time / len(due)
+                
+                for region_data, view in zip(due, views):
+                    start = time.perf_counter()
+                    frame = None
+                    try:
+                        if view is not None:
+                            frame = self.app.processor.detect_change(region_data, view)
+                        if frame is not None:
+                            self.ocr_queue.put(region_data['id'], (region_data, frame))
+                    except Exception as e:
+                        print(f"Error capturing region: {e}")
+                    cost = grab_cost + time.perf_counter() - start
+                    self.scheduler.record_poll(region_data['id'], frame is not None, cost)
+            
+            # Sleep until the next region is due; slow later stages never delay this
+            if self.wake_event.wait(min(self.scheduler.time_until_next(), 0.5)):
+                self.wake_event.clear()
+    
+    def _ocr_worker(self):
+        while self.running:
+            entry = self.ocr_queue.get(timeout=1.0)
+            if entry is None:
+                continue
+            key, (region_data, frame) = entry
+            try:
+                if self.app.is_region_active(region_data):
+                    start = time.perf_counter()
+                    blocks = self.app.processor.ocr_region(region_data, frame)
+                    self.scheduler.record_work(key, time.perf_counter() - start)
+                    if blocks is not None:
+                        self.translate_queue.put(key, (region_data, blocks))
+            except Exception as e:
+                print(f"Error reading region: {e}")
+            finally:
+                self.ocr_queue.task_done(key)
+    
+    def _translate_worker(self):
+        window = CONFIG.get("batch_window", 50) / 1000.0
+        while self.running:
+            batch = self.translate_queue.get_many(self.translate_queue.maxsize, window=window, timeout=1.0)
+            if not batch:
+                continue
+            try:
+                service = self.app.translation_service
+                target_lang = self.app.target_lang.get()
+                # Low on quota: regions that were translated recently only get cached text
+                deferred = set()
+                if service.budget is not None:
+                    deferred = {key for key, _ in batch if service.budget.defers(key)}
+                translations = {}
+                uncached = set()
+                if deferred:
+                    texts = [text for key, (_, blocks) in batch if key in deferred for _, text in blocks]
+                    translations.update(zip(texts, service.translate_texts(texts, target_lang, cache_only=True, missed=uncached)))
+                    self.app.metrics.increment('budget_deferred', len(deferred))
+                
+                # Translate each text block of every other region as its own unit, all in one request;
+                # blocks that did not change are answered by the in-memory cache
+                texts = [text for key, (_, blocks) in batch if key not in deferred for _, text in blocks]
+                paid = set()
+                translations.update(zip(texts, service.translate_texts(texts, target_lang, missed=paid)))
+                for key, (region_data, blocks) in batch:
+                    if key in deferred:
+                        # Names and text already in the target language come back unchanged
+                        # too, so only a real cache miss brings the region back later
+                        if any(text in uncached for _, text in blocks):
+                            # Look at the region again later instead of dropping its text
+                            self.app.processor.forget(key)
+                            region_data['last_blocks'] = None
+                    elif service.budget is not None and any(text in paid for _, text in blocks):
+                        service.budget.mark_paid(key)
+                    translated = [translations.get(text, text) for _, text in blocks]
+                    self.render_queue.put(key, (region_data, blocks, translated))
+            except Exception as e:
+                print(f"Translation error: {e}")
+            finally:
+                for key, _ in batch:
+                    self.translate_queue.task_done(key)
+    
+    def drain_render_queue(self):
+        """Apply all pending overlay updates; must be called on the Tk thread"""
+        for key, (region_data, blocks, translations) in self.render_queue.get_many(self.render_queue.maxsize, timeout=0):
+            try:
+                if self.app.is_region_active(region_data):
+                    start = time.perf_counter()
+                    self.app.show_region_translation(region_data, blocks, translations)
+                    self.app.metrics.record('render', time.perf_counter() - start, key)
+            except Exception as e:
+                print(f"Error showing translation: {e}")
+            finally:
+                self.render_queue.task_done(key)
+
+class OCRResultCache:
+    """LRU cache from an exact digest of a preprocessed image to its OCR result"""
+    def __init__(self, max_size=4096):
+        self.cache = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def digest(image):
+        # Include the shape so equal bytes with a different layout never collide
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr(image.shape).encode())
+        h.update(np.ascontiguousarray(image).data)
+        return h.digest()
+    
+    def get(self, key):
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, result):
+        with self.lock:
+            self.cache[key] = result
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+    
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+# Structuring elements for text detection: stroke edges, then characters into lines
+TEXT_GRADIENT_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+TEXT_LINE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+
+# Preprocessing chains the auto-tuner tries, cheapest first
+PREPROCESS_CHAINS = (
+    ('gray', 'otsu'),
+    ('gray', 'otsu', 'invert'),
+    ('gray', 'scale', 'otsu', 'invert'),
+    ('gray', 'adaptive', 'invert', 'denoise'),
+    ('gray', 'scale', 'adaptive', 'invert', 'denoise'),
+)
+
+def estimate_x_height(binary, boxes):
+    """Median glyph height inside the text boxes of a thresholded image
+    
+    Lowercase letters outnumber the rest in Latin text, so this is close to the
+    x-height; for CJK it is the full glyph height, which is what matters there.
+    """
+    heights = []
+    for left, top, right, bottom in boxes:
+        crop = binary[top:bottom, left:right]
+        # Glyphs are the minority colour
+        ink = (crop < 128 if crop.mean() > 127 else crop > 127).view(np.uint8)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        heights.extend(h for h, area in stats[1:count, 3:5].tolist() if h >= 3 and area >= 4)
+    return float(np.median(heights)) if heights else None
+
+class PreprocessGraph:
+    """A fixed chain of preprocessing steps that reuses its buffers across frames
+    
+    Steps: gray, scale (to CONFIG["ocr_x_height"]), otsu or adaptive threshold,
+    invert (only when text is light on dark) and denoise. Each step writes into
+    a buffer kept from the previous frame, so a region of fixed size allocates
+    nothing after its first frame. Buffers are per thread; the returned image
+    is one of them and is only valid until the thread's next run.
+    """
+    STEPS = ('gray', 'scale', 'otsu', 'adaptive', 'invert', 'denoise')
+    
+    def __init__(self, steps, x_height=None):
+        unknown = [step for step in steps if step not in self.STEPS]
+        if unknown:
+            print(f"Ignoring unknown preprocessing steps: {', '.join(unknown)}")
+        steps = tuple(step for step in steps if step in self.STEPS)
+        if 'gray' not in steps:
+            steps = ('gray',) + steps
+        
+        target = CONFIG.get("ocr_x_height", 20)
+        factor = min(4.0, max(0.5, target / x_height)) if x_height else 1.0
+        # Resizing by a few percent costs more than it gains
+        self.factor = factor if 'scale' in steps and abs(factor - 1.0) >= 0.2 else 1.0
+        # Adaptive threshold neighbourhood of about two x-heights
+        scaled_height = x_height * self.factor if x_height else target
+        self.block_size = max(11, 2 * int(scaled_height) + 1)
+        
+        self.steps = steps
+        self.key = (steps, round(self.factor, 2))
+        self.tuned = False
+        self.tuned_at = time.monotonic()
+        self.local = threading.local()
+        # Confidences of recently read words, to notice when the chain stops working
+        self.confidences = deque(maxlen=50)
+    
+    def buffer(self, index, shape):
+        buffers = getattr(self.local, 'buffers', None)
+        if buffers is None:
+            buffers = self.local.buffers = {}
+        buf = buffers.get(index)
+        if buf is None or buf.shape != shape:
+            buf = buffers[index] = np.empty(shape, np.uint8)
+        return buf
+    
+    def run(self, image):
+        img = np.asarray(image)
+        for index, step in enumerate(self.steps):
+            if step == 'gray':
+                if img.ndim == 3:
+                    img = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY, dst=self.buffer(index, img.shape[:2]))
+            elif step == 'scale':
+                if self.factor != 1.0:
+                    height, width = img.shape[:2]
+                    size = (max(1, round(width * self.factor)), max(1, round(height * self.factor)))
+                    interpolation = cv2.INTER_CUBIC if self.factor > 1.0 else cv2.INTER_AREA
+                    img = cv2.resize(img, size, dst=self.buffer(index, (size[1], size[0])), interpolation=interpolation)
+            elif step == 'otsu':
+                _, img = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=self.buffer(index, img.shape))
+            elif step == 'adaptive':
+                img = cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                                            self.block_size, 10, dst=self.buffer(index, img.shape))
+            elif step == 'invert':
+                # Tesseract wants dark text on a light background
+                if img.mean() < 127:
+                    img = cv2.bitwise_not(img, dst=self.buffer(index, img.shape))
+            elif step == 'denoise':
+                img = cv2.medianBlur(img, 3, dst=self.buffer(index, img.shape))
+        return img
+    
+    def to_frame(self, box):
+        """Map a box in the preprocessed image back to captured-frame pixels"""
+        if self.factor == 1.0:
+            return box
+        left, top, right, bottom = box
+        return (int(left / self.factor), int(top / self.factor),
+                int(np.ceil(right / self.factor)), int(np.ceil(bottom / self.factor)))
+    
+    def observe(self, words):
+        self.confidences.extend(word['conf'] for word in words)
+    
+    @property
+    def confidence(self):
+        return sum(self.confidences) / len(self.confidences) if self.confidences else 0.0
+    
+    def needs_retune(self):
+        """Recent words read with low confidence, and the last tuning was a while ago"""
+        return (len(self.confidences) == self.confidences.maxlen
+                and self.confidence < CONFIG.get('min_confidence', 30)
+                and time.monotonic() - self.tuned_at >= CONFIG.get("preprocess_retune_interval", 60))
+
+class RegionProcessor:
+    """Change detection and OCR for captured region frames, independent of the GUI"""
+    def __init__(self, ocr_engine=None, metrics=None, ocr_pool=None):
+        # With a process pool the engines live in the workers
+        self.ocr_pool = ocr_pool
+        self.ocr_engine = ocr_engine or (None if ocr_pool else create_ocr_engine())
+        self.ocr_cache = OCRResultCache(CONFIG.get("ocr_cache_size", 4096))
+        self.previous_hashes = {}
+        self.previous_thumbnails = {}
+        # Region id -> PreprocessGraph
+        self.preprocessors = {}
+        # Optional object with a record(stage, seconds) method
+        self.metrics = metrics
+    
+    def record(self, stage, start, region_id=None):
+        if self.metrics is not None:
+            self.metrics.record(stage, time.perf_counter() - start, region_id)
+    
+    def forget(self, region_id):
+        self.previous_hashes.pop(region_id, None)
+        self.previous_thumbnails.pop(region_id, None)
+    
+    def forget_region(self, region_id):
+        """Drop everything kept for a removed region"""
+        self.forget(region_id)
+        self.preprocessors.pop(region_id, None)
+    
+    def detect_change(self, region_data, img_array):
+        """Return a frame for OCR if the region's content changed"""
+        # Check if content changed using perceptual hash
+        start = time.perf_counter()
+        img_hash = self.compute_image_hash(img_array, region_data.get('hash_size', 8))
+        thumbnail = self.compute_thumbnail(img_array)
+        self.record('hash', start, region_data['id'])
+        
+        # Tolerate a few flipped bits from anti-aliasing noise, but a one-glyph
+        # edit can flip no bits at all, so confirm against a thumbnail first
+        previous = self.previous_hashes.get(region_data['id'])
+        if previous is not None:
+            if hamming_distance(img_hash, previous) <= region_data.get('hash_threshold', 0):
+                before = self.previous_thumbnails.get(region_data['id'])
+                if before is not None and before.shape == thumbnail.shape and \
+                        cv2.absdiff(before, thumbnail).max() <= CONFIG.get("change_tolerance", 24):
+                    if self.metrics is not None:
+                        self.metrics.increment('frames_skipped')
+                    return None  # No change
+        
+        self.previous_hashes[region_data['id']] = img_hash
+        self.previous_thumbnails[region_data['id']] = thumbnail
+        
+        # The view points into the shared capture buffer, so OCR gets its own copy
+        return img_array.copy()
+    
+    def ocr_region(self, region_data, frame):
+        """Read the text blocks of a captured frame and return them if they changed
+        
+        Returns [((left, top, right, bottom), text), ...] with boxes in frame
+        pixels, only blocks that need translating, or None if the frame reads
+        the same as the last one. Only boxes that look like text are handed to Tesseract, and a frame
+        without any is not OCR'd at all. OCR results are cached by an exact
+        digest of the captured pixels and the region's preprocessing chain,
+        both for the whole frame and for each text box, so a revisited screen
+        or an unchanged line never goes back through Tesseract. Preprocessing
+        is deterministic, so keying on the captured pixels is equivalent, lets
+        a frame hit skip preprocessing, and keeps box keys stable when the
+        global threshold shifts because of other content in the region.
+        """
+        graph = self.preprocessing_for(region_data, frame)
+        frame_key = (graph.key, self.ocr_cache.digest(frame))
+        blocks = self.ocr_cache.get(frame_key)
+        if blocks is None:
+            blocks = self.read_blocks(graph, frame, region_data['id'])
+            self.ocr_cache.put(frame_key, blocks)
+            if graph.tuned and region_data.get('preprocess', 'auto') == 'auto' and graph.needs_retune():
+                # The content changed character (e.g. a theme switch); tune again on the next frame
+                self.preprocessors.pop(region_data['id'], None)
+        
+        # Skip blocks that are too short or just numbers/symbols
+        layout = [(box, text) for box, text in self.layout_blocks(blocks) if needs_translation(text)]
+        if layout == region_data['last_blocks']:
+            return None
+        
+        region_data['last_blocks'] = layout
+        return layout
+    
+    def read_blocks(self, graph, frame, region_id):
+        """Preprocess a frame, find its text boxes and OCR them
+        
+        Returns (left, top, right, bottom, words) per box in frame pixels.
+        """
+        start = time.perf_counter()
+        processed_img = graph.run(frame)
+        self.record('preprocess', start, region_id)
+        
+        start = time.perf_counter()
+        if CONFIG.get("text_detection", True):
+            boxes = self.find_text_boxes(processed_img)
+        else:
+            width = processed_img.shape[1]
+            boxes = [(0, top, width, bottom) for top, bottom in self.find_text_bands(processed_img)]
+        self.record('detect', start, region_id)
+        if not boxes and self.metrics is not None:
+            self.metrics.increment('ocr_skipped')
+        
+        min_confidence = CONFIG.get('min_confidence', 30)
+        blocks = []
+        for box in boxes:
+            left, top, right, bottom = graph.to_frame(box)
+            box_key = (graph.key, self.ocr_cache.digest(frame[top:bottom, left:right]))
+            words = self.ocr_cache.get(box_key)
+            if words is None:
+                start = time.perf_counter()
+                # Read every word so the chain's confidence can be tracked, then keep the confident ones
+                words = self.read_words(processed_img[box[1]:box[3], box[0]:box[2]], min_confidence=0)
+                self.record('ocr', start, region_id)
+                graph.observe(words)
+                words = [word for word in words if word['conf'] > min_confidence]
+                if graph.factor != 1.0:
+                    # Word boxes in frame pixels, relative to the text box
+                    for word in words:
+                        for field in ('left', 'top', 'width', 'height'):
+                            word[field] = int(word[field] / graph.factor)
+                self.ocr_cache.put(box_key, words)
+            blocks.append((left, top, right, bottom, words))
+        return blocks
+    
+    def preprocessing_for(self, region_data, frame):
+        """The region's preprocessing graph, tuned on this frame if it is not yet
+        
+        Until a frame with text shows up the region uses the cheapest chain. With
+        "preprocess" set to "auto" the chains in PREPROCESS_CHAINS are OCR'd in
+        order of cost and the first whose mean word confidence clears
+        min_confidence wins (the most confident one if none does). An explicit
+        chain is only tuned for the x-height its "scale" step resizes to.
+        """
+        region_id = region_data['id']
+        graph = self.preprocessors.get(region_id)
+        if graph is not None and graph.tuned:
+            return graph
+        
+        spec = region_data.get('preprocess', 'auto')
+        if spec != 'auto' and 'scale' not in spec:
+            graph = self.preprocessors[region_id] = PreprocessGraph(spec)
+            graph.tuned = True
+            return graph
+        
+        base = graph or PreprocessGraph(PREPROCESS_CHAINS[0])
+        self.preprocessors[region_id] = base
+        binary = base.run(frame)
+        boxes = self.find_text_boxes(binary)
+        if not boxes:
+            return base
+        
+        start = time.perf_counter()
+        x_height = estimate_x_height(binary, boxes)
+        if spec != 'auto':
+            best = PreprocessGraph(spec, x_height)
+        else:
+            min_confidence = CONFIG.get('min_confidence', 30)
+            base.confidences.clear()
+            best = None
+            tried = set()
+            for steps in PREPROCESS_CHAINS:
+                graph = base if steps == base.steps else PreprocessGraph(steps, x_height)
+                if graph.key in tried:
+                    continue  # Text already at the target size, so "scale" is a no-op
+                tried.add(graph.key)
+                # The winner's OCR results stay cached for the frame being tuned on
+                self.read_blocks(graph, frame, region_id)
+                if best is None or graph.confidence > best.confidence:
+                    best = graph
+                if graph.confidence >= min_confidence:
+                    break
+        self.record('tune', start, region_id)
+        
+        best.tuned = True
+        best.tuned_at = time.monotonic()
+        self.preprocessors[region_id] = best
+        return best
+    
+    def read_words(self, image, min_confidence=None):
+        """OCR a preprocessed image into a list of confident words with their boxes"""
+        if min_confidence is None:
+            min_confidence = CONFIG.get('min_confidence', 30)  # Use configurable confidence threshold
+        if self.ocr_pool is not None:
+            return self.ocr_pool.read_words(image, min_confidence)
+        # Extract text with data about positions
+        ocr_data = self.ocr_engine.image_to_data(image)
+        return filter_words(ocr_data, min_confidence)
+    
+    def layout_blocks(self, blocks):
+        """Group OCR'd line boxes into blocks of text in reading order
+        
+        Words of one box that Tesseract puts in different blocks (e.g. columns
+        of a full-width band) are split apart first. Lines of similar height
+        stacked with regular spacing and aligned left edges or centres (a
+        paragraph, a chat log, a two-line subtitle) are then joined into one
+        block with one overlay. Its lines stay separated by line breaks, which
+        split_segments treats as segment boundaries, so a log that gains a line
+        only sends the new line to the provider.
+        """
+        lines = []
+        for left, top, right, bottom, words in blocks:
+            groups = {}
+            for word in words:
+                groups.setdefault(word['block_num'], []).append(word)
+            if len(groups) == 1:
+                lines.append(((left, top, right, bottom), self.words_to_text(words)))
+                continue
+            for group in groups.values():
+                box = (
+                    left + min(word['left'] for word in group),
+                    top + min(word['top'] for word in group),
+                    left + max(word['left'] + word['width'] for word in group),
+                    top + max(word['top'] + word['height'] for word in group)
+                )
+                lines.append((box, self.words_to_text(group)))
+        # Reading order: rows of boxes that start at about the same height, each left to right
+        lines.sort(key=lambda line: line[0][1])
+        rows = []
+        for line in lines:
+            if rows and line[0][1] - rows[-1][0][0][1] <= 0.5 * (rows[-1][0][0][3] - rows[-1][0][0][1]):
+                rows[-1].append(line)
+            else:
+                rows.append([line])
+        lines = [line for row in rows for line in sorted(row, key=lambda line: line[0][0])]
+        
+        layout = []  # [box, text, last line box, gap between its lines]
+        for box, text in lines:
+            if not text:
+                continue
+            left, top, right, bottom = box
+            for block in layout:
+                last_left, last_top, last_right, last_bottom = block[2]
+                line_height = last_bottom - last_top
+                gap = top - last_bottom
+                aligned = (abs(left - last_left) <= 0.5 * line_height
+                           or abs((left + right) - (last_left + last_right)) <= line_height)
+                similar = 0.75 <= (bottom - top) / line_height <= 1.33
+                close = -0.5 * line_height <= gap <= 0.6 * line_height
+                regular = block[3] is None or abs(gap - block[3]) <= max(2, 0.25 * line_height)
+                if aligned and similar and close and regular:
+                    joined = block[1]
+                    # Undo a hyphen that split a word across the lines
+                    if joined.endswith('-') and text[:1].islower():
+                        joined = joined[:-1] + text
+                    else:
+                        joined = joined + '\n' + text
+                    block_box = block[0]
+                    block[:] = [
+                        (min(block_box[0], left), block_box[1], max(block_box[2], right), max(block_box[3], bottom)),
+                        joined, box, gap
+                    ]
+                    break
+            else:
+                layout.append([box, text, box, None])
+        return [(box, text) for box, text, _, _ in layout]
+    
+    def words_to_text(self, words):
+        """Join OCR words into a single cleaned-up line of text"""
+        text = ' '.join(word['text'] for word in words)
+        # Remove extra whitespace
+        text = ' '.join(text.split())
+        # Remove any null characters that might cause issues
+        return text.replace('\x00', '').replace('\r', ' ').replace('\n', ' ')
+    
+    def find_text_bands(self, binary):
+        """Split a thresholded image into horizontal bands of text lines"""
+        # Text is the minority colour after thresholding
+        ink = binary < 128 if binary.mean() > 127 else binary > 127
+        rows = np.count_nonzero(ink, axis=1) > max(1, binary.shape[1] // 500)
+        
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], rows.view(np.int8), [0]))))
+        runs = list(zip(edges[::2], edges[1::2]))
+        
+        # Merge runs split by small gaps (e.g. between the dot and stem of an i)
+        min_gap = CONFIG.get("band_min_gap", 3)
+        bands = []
+        for start, end in runs:
+            if bands and start - bands[-1][1] < min_gap:
+                bands[-1][1] = end
+            else:
+                bands.append([start, end])
+        
+        # Pad so Tesseract does not see glyphs touching the edge; drop specks
+        height = binary.shape[0]
+        pad = 3
+        return [
+            (max(0, int(start) - pad), min(height, int(end) + pad))
+            for start, end in bands if end - start >= 4
+        ]
+    
+    def find_text_boxes(self, binary):
+        """Find boxes around lines of text in a thresholded image
+        
+        The morphological gradient keeps stroke edges whatever the text polarity;
+        a wide, flat closing joins the characters of a line but not the lines of
+        a paragraph. Clusters too tall, too thin or too sparse for a line of text
+        (artwork, video, panel borders) are dropped.
+        """
+        gradient = cv2.morphologyEx(binary, cv2.MORPH_GRADIENT, TEXT_GRADIENT_KERNEL)
+        joined = cv2.morphologyEx(gradient, cv2.MORPH_CLOSE, TEXT_LINE_KERNEL)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(joined, connectivity=8)
+        
+        min_height = CONFIG.get("text_min_height", 6)
+        max_height = CONFIG.get("text_max_height", 150)
+        candidates = []
+        for x, y, w, h, area in stats[1:count].tolist():
+            if min_height <= h <= max_height and w >= min_height and area >= 0.2 * w * h:
+                candidates.append([x, y, x + w, y + h])
+        
+        # Merge the words of a line that the closing left apart
+        candidates.sort()
+        lines = []
+        for box in candidates:
+            for line in lines:
+                overlap = min(line[3], box[3]) - max(line[1], box[1])
+                height = max(line[3] - line[1], box[3] - box[1])
+                if overlap >= 0.5 * min(line[3] - line[1], box[3] - box[1]) and box[0] - line[2] <= 1.5 * height:
+                    line[:] = [min(line[0], box[0]), min(line[1], box[1]), max(line[2], box[2]), max(line[3], box[3])]
+                    break
+            else:
+                lines.append(box)
+        
+        # Pad so Tesseract does not see glyphs touching the edge
+        height, width = binary.shape[:2]
+        pad = 3
+        return sorted(
+            (max(0, left - pad), max(0, top - pad), min(width, right + pad), min(height, bottom + pad))
+            for left, top, right, bottom in lines
+        )
+    
+    def compute_image_hash(self, img_array, hash_size=8):
+        """Compute a difference hash of the image packed into an integer"""
+        # Shrink first so the grayscale conversion only touches a few pixels
+        img = cv2.resize(img_array, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        
+        # One bit per pixel: is it brighter than its right-hand neighbour
+        bits = np.packbits(gray[:, 1:] > gray[:, :-1])
+        
+        return int.from_bytes(bits.tobytes(), 'big')
+    
+    def compute_thumbnail(self, img_array):
+        """Shrink the image to a grayscale thumbnail of 4x4 pixel cells"""
+        height, width = img_array.shape[:2]
+        img = cv2.resize(img_array, (max(1, width // 4), max(1, height // 4)), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+    
+    def close(self):
+        if self.ocr_engine is not None:
+            self.ocr_engine.close()
+        if self.ocr_pool is not None:
+            self.ocr_pool.close()
+
+class TokenBucket:
+    """Token-bucket rate limiter: rate tokens per second, bursts up to capacity"""
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens=1, timeout=None):
+        """Wait until tokens are available; False if that would take longer than timeout"""
+        tokens = min(tokens, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class CharacterLedger:
+    """Characters sent to each provider in the current month, persisted as JSON"""
+    def __init__(self, path=None, save_interval=5.0):
+        self.path = path
+        self.save_interval = save_interval
+        self.providers = {}
+        self.dirty = False
+        self.saved = 0.0
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.providers = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Could not read usage ledger: {e}")
+    
+    def _entry(self, provider):
+        month = time.strftime('%Y-%m')
+        entry = self.providers.get(provider)
+        if not entry or entry.get('month') != month:
+            # New month: start counting from zero, keep the limit the provider reported
+            limit = entry.get('limit') if entry else None
+            entry = self.providers[provider] = {'month': month, 'characters': 0, 'limit': limit}
+        return entry
+    
+    def used(self, provider):
+        with self.lock:
+            return self._entry(provider)['characters']
+    
+    def limit(self, provider):
+        with self.lock:
+            return self._entry(provider).get('limit')
+    
+    def add(self, provider, characters):
+        with self.lock:
+            self._entry(provider)['characters'] += characters
+            self.dirty = True
+        if time.time() - self.saved >= self.save_interval:
+            self.save()
+    
+    def reconcile(self, provider, characters, limit=None):
+        """Replace the local count with the provider's own figures"""
+        with self.lock:
+            entry = self._entry(provider)
+            entry['characters'] = characters
+            if limit:
+                entry['limit'] = limit
+            entry['reconciled'] = time.time()
+            self.dirty = True
+        self.save()
+    
+    def save(self):
+        with self.lock:
+            if not self.path or not self.dirty:
+                return
+            data = json.dumps(self.providers, indent=2)
+            self.dirty = False
+            self.saved = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Write then rename so a crash never leaves a truncated ledger
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Could not save usage ledger: {e}")
+
+class TranslationBudget:
+    """Rate limit and monthly character quota for one translation provider"""
+    def __init__(self, provider, ledger, limit=None, rate=None, burst=None, reconcile_interval=600.0):
+        self.provider = provider
+        self.ledger = ledger
+        self.configured_limit = limit
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.reconcile_interval = reconcile_interval
+        self.reconciled = 0.0
+        self.warned = False
+    
+    @property
+    def limit(self):
+        # Once reconciled, the provider's own limit wins over the configured one
+        return self.ledger.limit(self.provider) or self.configured_limit
+    
+    def remaining(self):
+        """Characters left this month, or None without a limit"""
+        limit = self.limit
+        if not limit:
+            return None
+        return max(0, limit - self.ledger.used(self.provider))
+    
+    def level(self):
+        """Share of the monthly quota left (1.0 without a limit)"""
+        limit = self.limit
+        if not limit:
+            return 1.0
+        return max(0, limit - self.ledger.used(self.provider)) / limit
+    
+    def covers(self, characters):
+        """Whether the quota left can pay for characters"""
+        remaining = self.remaining()
+        if remaining is not None and characters > remaining:
+            if not self.warned:
+                print(f"{self.provider} character budget exhausted ({remaining:,} left this month), not sending it more text")
+                self.warned = True
+            return False
+        self.warned = False
+        return True
+    
+    def throttle(self):
+        """Wait for the rate limiter"""
+        if self.bucket:
+            self.bucket.acquire()
+    
+    def admit(self, characters):
+        """Wait for the rate limiter; False if the quota cannot cover characters"""
+        if not self.covers(characters):
+            return False
+        self.throttle()
+        return True
+    
+    def charge(self, characters):
+        self.ledger.add(self.provider, characters)
+    
+    def reconcile(self, translator):
+        """Take over the provider's usage report when it is due and available"""
+        if time.time() - self.reconciled < self.reconcile_interval:
+            return
+        self.reconciled = time.time()
+        if hasattr(translator, 'usage'):
+            usage = translator.usage()
+            if usage:
+                self.ledger.reconcile(self.provider, *usage)
+    
+    def close(self):
+        self.ledger.save()
+
+class TranslationBudgets:
+    """The budget of every routed provider, and throttling of busy regions when all run low"""
+    def __init__(self, budgets, reserve=0.1, low_interval=30.0):
+        self.budgets = budgets  # provider -> TranslationBudget
+        self.reserve = reserve
+        self.low_interval = low_interval
+        self.last_paid = {}  # region id -> time of its last paid translation
+        self.lock = threading.Lock()
+    
+    def get(self, provider):
+        return self.budgets.get(provider)
+    
+    def level(self):
+        """Share of the quota left at the best-off provider (1.0 if one has no limit)"""
+        return max((budget.level() for budget in self.budgets.values()), default=1.0)
+    
+    def defers(self, region_id):
+        """Whether a region should make do with cached translations for now
+        
+        Once every provider is below the reserve, each region may only trigger
+        a paid request every low_interval seconds, stretched further as the
+        quota shrinks, so regions that change constantly stop draining what is
+        left. A provider without a limit (offline, googletrans) keeps this off.
+        """
+        level = self.level()
+        if level >= self.reserve:
+            return False
+        interval = self.low_interval * self.reserve / max(level, 0.01)
+        with self.lock:
+            last = self.last_paid.get(region_id)
+        return last is not None and time.time() - last < interval
+    
+    def mark_paid(self, region_id):
+        with self.lock:
+            self.last_paid[region_id] = time.time()
+    
+    def forget(self, region_id):
+        with self.lock:
+            self.last_paid.pop(region_id, None)
+    
+    def close(self):
+        for budget in self.budgets.values():
+            budget.close()
+
+class TranslationError(Exception):
+    """A translation backend failed to answer"""
+
+class BudgetExhausted(TranslationError):
+    """No translation backend has the characters left for a request"""
+
+class TranslationResult:
+    """One translated text, its detected source language and the backend that produced it"""
+    __slots__ = ('text', 'source_lang', 'provider')
+    
+    def __init__(self, text, source_lang=None, provider=None):
+        self.text = text
+        self.source_lang = source_lang
+        self.provider = provider
+    
+    def __repr__(self):
+        return f"TranslationResult({self.text!r}, source_lang={self.source_lang!r}, provider={self.provider!r})"
+
+def translate_with(translator, texts, target_lang, source_lang='auto'):
+    """Translate texts with any supported client and return a TranslationResult per text"""
+    if hasattr(translator, 'translate_many'):
+        return translator.translate_many(texts, target_lang, source_lang)
+    # googletrans and the Google Cloud client both accept a list, target second,
+    # and detect the source language themselves
+    provider = getattr(translator, 'provider', type(translator).__module__.split('.')[0])
+    results = []
+    for result in translator.translate(texts, target_lang):
+        if isinstance(result, dict):
+            results.append(TranslationResult(result['translatedText'], result.get('detectedSourceLanguage'), provider))
+        else:
+            results.append(TranslationResult(result.text, getattr(result, 'src', None), provider))
+    return results
+
+class HTTPTranslateClient:
+    """Base for HTTP translation APIs
+    
+    Subclasses describe one request with _chunk_request() and read its reply
+    with _parse_chunk(). With httpx installed, every chunk of a call is in
+    flight at once on the shared event loop; otherwise they go out one after
+    another through the shared requests session.
+    """
+    provider = None
+    max_batch_size = 50
+    max_batch_chars = 30000
+    timeout = 15
+    warm_up_url = None
+    headers = {}
+    
+    def __init__(self):
+        self.session = get_http_session()
+    
+    def translate_many(self, texts, target_lang, source_lang='auto'):
+        """Translate texts and return a TranslationResult per text"""
+        if HTTPX_AVAILABLE:
+            return run_async(self.translate_many_async(texts, target_lang, source_lang))
+        results = []
+        for chunk in self._chunks(texts):
+            results.extend(self._send(chunk, target_lang, source_lang))
+        return results
+    
+    async def translate_many_async(self, texts, target_lang, source_lang='auto'):
+        """Coroutine version of translate_many; must run on the shared event loop"""
+        replies = await asyncio.gather(
+            *(self._send_async(chunk, target_lang, source_lang) for chunk in self._chunks(texts))
+        )
+        return [result for reply in replies for result in reply]
+    
+    def _chunks(self, texts):
+        return chunk_texts([text[:5000] for text in texts], self.max_batch_size, self.max_batch_chars)
+    
+    def _send(self, texts, target_lang, source_lang):
+        url, params, data = self._chunk_request(texts, target_lang, source_lang)
+        try:
+            response = self.session.post(url, params=params, data=data, headers=self.headers, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            raise TranslationError(f"{self.provider} request timed out")
+        except requests.exceptions.RequestException as e:
+            raise TranslationError(f"{self.provider} network error: {e}")
+        return self._parse_chunk(response, texts)
+    
+    async def _send_async(self, texts, target_lang, source_lang):
+        url, params, data = self._chunk_request(texts, target_lang, source_lang)
+        try:
+            response = await get_async_client().post(
+                url, params=params, data=data, headers=self.headers, timeout=self.timeout
+            )
+        except httpx.TimeoutException:
+            raise TranslationError(f"{self.provider} request timed out")
+        except httpx.HTTPError as e:
+            raise TranslationError(f"{self.provider} network error: {e}")
+        return self._parse_chunk(response, texts)
+    
+    def warm_up(self):
+        """Open a pooled TLS connection before the first real request"""
+        try:
+            if HTTPX_AVAILABLE:
+                run_async(self._warm_up_async(), timeout=5)
+            else:
+                self.session.head(self.warm_up_url, headers=self.headers, timeout=5)
+        except (requests.exceptions.RequestException, FutureTimeoutError):
+            pass
+    
+    async def _warm_up_async(self):
+        try:
+            await get_async_client().head(self.warm_up_url, headers=self.headers)
+        except httpx.HTTPError:
+            pass
+
+class GoogleTranslateWithAPIKey(HTTPTranslateClient):
+    """Google Cloud Translation v2 REST API authenticated with an API key"""
+    # Request limits of the v2 endpoint
+    provider = "google"
+    max_batch_size = 128
+    max_batch_chars = 30000
+    timeout = 10
+    
+    def __init__(self, api_key):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = "https://translation.googleapis.com/language/translate/v2"
+        self.warm_up_url = self.base_url
+        # Google only gzips responses for user agents that ask for it
+        self.headers = {'User-Agent': 'Polyglot/1.0 (gzip)'}
+    
+    def _chunk_request(self, texts, target_lang, source_lang):
+        params = {
+            'target': target_lang,
+            'key': self.api_key,
+            'format': 'text'  # Specify plain text format
+        }
+        if source_lang and source_lang != 'auto':
+            params['source'] = source_lang
+        # POST keeps the texts out of the URL and its length limit
+        return self.base_url, params, {'q': [text.strip() for text in texts]}
+    
+    def _parse_chunk(self, response, texts):
+        if response.status_code == 200:
+            result = response.json()
+            if 'data' in result and 'translations' in result['data']:
+                return [
+                    TranslationResult(t['translatedText'], t.get('detectedSourceLanguage'), self.provider)
+                    for t in result['data']['translations']
+                ]
+            # Never hand back the input as a translation, it would be cached as one
+            raise TranslationError(f"Unexpected API response: {result}")
+        
+        error_data = response.json() if response.content else {}
+        error_msg = error_data.get('error', {}).get('message', 'Unknown error')
+        print(f"Translation API error {response.status_code}: {error_msg}")
+        
+        if response.status_code == 403:
+            raise TranslationError(f"API key error: {error_msg}")
+        elif response.status_code == 400:
+            # Bad request - possibly due to special characters or language code
+            raise TranslationError(f"Bad request: {error_msg}")
+        raise TranslationError(f"Translation API error: {response.status_code} - {error_msg}")
+
+class DeepLTranslateClient(HTTPTranslateClient):
+    """DeepL REST API, free or pro tier"""
+    # DeepL accepts up to 50 texts and 128 KiB per request
+    provider = "deepl"
+    max_batch_size = 50
+    max_batch_chars = 120000
+    
+    # Language mapping for DeepL
+    lang_map = {
+        'zh-cn': 'ZH',
+        'zh-tw': 'ZH',
+        'zh': 'ZH',
+        'en': 'EN',
+        'es': 'ES',
+        'fr': 'FR',
+        'de': 'DE',
+        'it': 'IT',
+        'pt': 'PT',
+        'ru': 'RU',
+        'ja': 'JA',
+        'ko': 'KO',
+        'ar': 'AR',
+        'hi': 'HI',
+        'nl': 'NL',
+        'pl': 'PL',
+        'sv': 'SV',
+        'da': 'DA',
+        'fi': 'FI',
+        'no': 'NB',
+        'cs': 'CS',
+        'hu': 'HU',
+        'ro': 'RO',
+        'sk': 'SK',
+        'sl': 'SL',
+        'et': 'ET',
+        'lv': 'LV',
+        'lt': 'LT',
+        'bg': 'BG',
+        'el': 'EL',
+        'tr': 'TR',
+        'uk': 'UK',
+        'id': 'ID',
+    }
+    
+    def __init__(self, api_key=None, use_free=True):
+        super().__init__()
+        self.api_key = api_key
+        # DeepL free vs pro API endpoints
+        self.base_url = "https://api-free.deepl.com/v2" if use_free else "https://api.deepl.com/v2"
+        self.warm_up_url = f"{self.base_url}/usage"
+        self.headers = {
+            'Authorization': f'DeepL-Auth-Key {self.api_key}',
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+        
+        if self.api_key:
+            self._test_connection()
+    
+    def _test_connection(self):
+        """Test if DeepL API key is valid"""
+        try:
+            response = self.session.get(f"{self.base_url}/usage", headers=self.headers, timeout=5)
+            if response.status_code == 200:
+                usage_data = response.json()
+                print(f"Connected to DeepL API - Usage: {usage_data.get('character_count', 0)}/{usage_data.get('character_limit', 'unlimited')} characters")
+                return True
+            else:
+                raise Exception(f"API returned status {response.status_code}")
+        except Exception as e:
+            raise Exception(f"Cannot connect to DeepL API: {e}")
+    
+    def usage(self):
+        """Characters used and allowed this billing period, from /v2/usage"""
+        try:
+            response = self.session.get(f"{self.base_url}/usage", headers=self.headers, timeout=5)
+            if response.status_code == 200:
+                usage_data = response.json()
+                return usage_data.get('character_count', 0), usage_data.get('character_limit')
+            print(f"DeepL usage check failed: {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            print(f"DeepL usage check failed: {e}")
+        return None
+    
+    def _chunk_request(self, texts, target_lang, source_lang):
+        # Map language codes to DeepL format
+        target = self.lang_map.get(target_lang.lower(), target_lang.upper())
+        if target not in self.lang_map.values():
+            # Let the router hand the batch to a backend that supports it
+            raise TranslationError(f"Language {target_lang} not supported by DeepL")
+        data = {'text': [text.strip() for text in texts], 'target_lang': target}
+        if source_lang and source_lang != 'auto':
+            data['source_lang'] = self.lang_map.get(source_lang.lower(), source_lang.upper())
+        return f"{self.base_url}/translate", None, data
+    
+    def _parse_chunk(self, response, texts):
+        if response.status_code == 200:
+            return [
+                TranslationResult(t['text'], t.get('detected_source_language', '').lower() or None, self.provider)
+                for t in response.json()['translations']
+            ]
+        elif response.status_code == 403:
+            raise TranslationError("DeepL API key invalid or quota exceeded")
+        elif response.status_code == 456:
+            raise TranslationError("DeepL quota exceeded")
+        raise TranslationError(f"DeepL API error: {response.status_code}")
+
+class CircuitBreaker:
+    """Stops routing to a backend whose recent calls failed or broke the latency SLO"""
+    def __init__(self, name, error_rate=0.5, latency_slo=2.0, window=20, min_calls=4, cooldown=30.0):
+        self.name = name
+        self.error_rate = error_rate
+        self.latency_slo = latency_slo
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.recent = deque(maxlen=window)  # True for each bad call
+        self.state = 'closed'
+        self.opened = 0.0
+        self.trial = False
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        """Whether a call may go out; an open circuit lets one trial through after the cooldown"""
+        with self.lock:
+            if self.state == 'open' and time.time() - self.opened >= self.cooldown:
+                self.state = 'half-open'
+                self.trial = False
+            if self.state == 'open':
+                return False
+            if self.state == 'half-open':
+                if self.trial:
+                    return False
+                self.trial = True
+            return True
+    
+    def record(self, success, latency):
+        bad = not success or latency > self.latency_slo
+        with self.lock:
+            if self.state == 'half-open':
+                if bad:
+                    self._open()
+                else:
+                    self.state = 'closed'
+                    self.recent.clear()
+                    print(f"{self.name} recovered, routing translations to it again")
+                return
+            self.recent.append(bad)
+            if self.state == 'closed' and len(self.recent) >= self.min_calls:
+                if sum(self.recent) / len(self.recent) >= self.error_rate:
+                    self._open()
+    
+    def _open(self):
+        if self.state == 'closed':
+            print(f"{self.name} is failing or slow, routing translations elsewhere for {self.cooldown:g}s")
+        self.state = 'open'
+        self.opened = time.time()
+
+class TranslationRouter:
+    """Routes translation batches across backends with failover and hedging
+    
+    Backends are tried in priority order, skipping those whose circuit is
+    open, that cannot translate the language pair or whose budget cannot
+    cover the batch. If the running request has
+    not answered within the latency SLO, the same batch also goes to the
+    next backend and the first successful answer is returned; a failed
+    request fails over immediately. Every answered request is charged to the
+    provider that answered it, hedges that lost the race included.
+    """
+    def __init__(self, backends, latency_slo=2.0, error_rate=0.5, cooldown=30.0, budgets=None):
+        self.backends = [
+            (name, client, CircuitBreaker(name, error_rate, latency_slo, cooldown=cooldown))
+            for name, client in backends
+        ]
+        self.budgets = budgets
+        self.latency_slo = latency_slo
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(self.backends), thread_name_prefix="translate")
+        self.hedged = 0
+        self.failovers = 0
+    
+    @property
+    def provider(self):
+        return self.backends[0][0]
+    
+    def translate_many(self, texts, target_lang, source_lang='auto'):
+        remaining = iter(self.backends)
+        pending = {}
+        errors = []
+        refused = []
+        unsupported = []
+        characters = sum(len(text) for text in texts)
+        
+        def launch():
+            for name, client, breaker in remaining:
+                # A missing model is not a failure, so the breaker never hears of it
+                if hasattr(client, 'supports') and not client.supports(source_lang, target_lang):
+                    unsupported.append(name)
+                    continue
+                budget = self.budgets.get(name) if self.budgets is not None else None
+                if budget is not None:
+                    budget.reconcile(client)
+                    if not budget.covers(characters):
+                        refused.append(name)
+                        continue
+                if breaker.allow():
+                    if budget is not None:
+                        budget.throttle()
+                    pending[self.executor.submit(self._call, name, client, breaker, texts, target_lang, source_lang)] = name
+                    return True
+            return False
+        
+        if not launch():
+            if refused and len(refused) + len(unsupported) == len(self.backends):
+                raise BudgetExhausted("no translation backend has characters left this month")
+            raise TranslationError("all translation backends are unavailable")
+        while pending:
+            done, _ = wait(pending, timeout=self.latency_slo, return_when=FIRST_COMPLETED)
+            if not done:
+                # Still waiting past the SLO: race the next backend
+                if launch():
+                    self.hedged += 1
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+            if not pending and launch():
+                self.failovers += 1
+        raise TranslationError('; '.join(errors))
+    
+    def _call(self, name, client, breaker, texts, target_lang, source_lang):
+        start = time.perf_counter()
+        try:
+            result = translate_with(client, texts, target_lang, source_lang)
+        except Exception:
+            breaker.record(False, time.perf_counter() - start)
+            raise
+        breaker.record(True, time.perf_counter() - start)
+        if self.budgets is not None:
+            provider = result[0].provider if result and result[0].provider else name
+            budget = self.budgets.get(provider) or self.budgets.get(name)
+            if budget is not None:
+                budget.charge(sum(len(text) for text in texts))
+        return result
+    
+    def states(self):
+        return {name: breaker.state for name, _, breaker in self.backends}
+    
+    def warm_up(self):
+        for _, client, _ in self.backends:
+            if hasattr(client, 'warm_up'):
+                client.warm_up()
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class OfflineTranslateClient:
+    """Translates on the CPU with installed Argos Translate models
+    
+    Models stay loaded after first use, and each call runs all texts through
+    CTranslate2 as one batch, so lines from many regions share an inference.
+    """
+    provider = "offline"
+    
+    def __init__(self, source_lang=None, threads=None, batch_size=None):
+        self.source_lang = source_lang or CONFIG.get("offline_source_lang")
+        self.threads = threads or CONFIG.get("offline_threads", 4)
+        self.batch_size = batch_size or CONFIG.get("offline_batch_size", 32)
+        self.models = {}  # (source, target) -> ctranslate2.Translator
+        self.lock = threading.Lock()
+        self.packages = {
+            (pkg.from_code, pkg.to_code): pkg for pkg in argos_package.get_installed_packages()
+        }
+    
+    def language_code(self, lang):
+        """Argos code of a language code such as zh-CN"""
+        lang = lang.lower()
+        if lang in ('zh-tw', 'zh-hant') and any(to_code == 'zt' for _, to_code in self.packages):
+            return 'zt'
+        return lang.split('-')[0]
+    
+    def supports(self, source_lang, target_lang):
+        """Whether an installed model translates the pair; 'auto' needs offline_source_lang"""
+        if source_lang == 'auto':
+            source_lang = self.source_lang
+        if not source_lang:
+            return False
+        source_lang, target_lang = self.language_code(source_lang), self.language_code(target_lang)
+        return source_lang == target_lang or (source_lang, target_lang) in self.packages
+    
+    def _model(self, source_lang, target_lang):
+        with self.lock:
+            if (source_lang, target_lang) not in self.models:
+                pkg = self.packages.get((source_lang, target_lang))
+                if pkg is None:
+                    raise TranslationError(f"No offline model installed for {source_lang} -> {target_lang}")
+                self.models[(source_lang, target_lang)] = ctranslate2.Translator(
+                    str(pkg.package_path / "model"),
+                    device="cpu",
+                    compute_type="int8",
+                    # One batch per translate worker can run at the same time
+                    inter_threads=CONFIG.get("translate_workers", 2),
+                    intra_threads=self.threads
+                )
+            return self.models[(source_lang, target_lang)]
+    
+    def warm_up(self):
+        """Load the model for the default language pair ahead of the first translation"""
+        if not self.source_lang:
+            return
+        pair = (self.language_code(self.source_lang), self.language_code(CONFIG["default_target_lang"]))
+        if pair in self.packages:
+            self._model(*pair)
+    
+    def translate_many(self, texts, target_lang, source_lang='auto'):
+        if source_lang == 'auto':
+            # Guessing would run text through the wrong model and cache the result
+            if not self.source_lang:
+                raise TranslationError("Offline translation needs a detected source language or offline_source_lang")
+            source_lang = self.source_lang
+        source_lang, target_lang = self.language_code(source_lang), self.language_code(target_lang)
+        if source_lang == target_lang:
+            return [TranslationResult(text, source_lang, self.provider) for text in texts]
+        translator = self._model(source_lang, target_lang)
+        pkg = self.packages[(source_lang, target_lang)]
+        tokenized = [pkg.tokenizer.encode(text.strip()) for text in texts]
+        # Multilingual models pick the output language from a prefix token
+        prefix = getattr(pkg, 'target_prefix', '')
+        results = translator.translate_batch(
+            tokenized,
+            target_prefix=[[prefix]] * len(tokenized) if prefix else None,
+            max_batch_size=self.batch_size,
+            beam_size=2
+        )
+        
+        translations = []
+        for result in results:
+            value = pkg.tokenizer.decode(result.hypotheses[0])
+            if prefix and value.startswith(prefix):
+                value = value[len(prefix):]
+            translations.append(TranslationResult(value.strip(), source_lang, self.provider))
+        return translations
+
+class InflightTranslation:
+    """A translation request other callers can wait on instead of repeating it"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+class TranslationService:
+    """Cache-aware, batched access to the active translation client"""
+    def __init__(self, translator, cache, metrics=None, budget=None):
+        self.translator = translator
+        self.cache = cache
+        self.metrics = metrics
+        self.budget = budget
+        # (text, source, target) -> InflightTranslation shared by concurrent callers
+        self.inflight = {}
+        self.inflight_lock = threading.Lock()
+        # Requests for the source languages of one batch go out side by side
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="translate-group")
+    
+    def translate_texts(self, texts, target_lang, cache_only=False, missed=None):
+        """Translate a list of texts sentence by sentence
+        
+        Each sentence is cached on its own, so text that only gained a sentence
+        or a line only sends the new part to the provider. With cache_only,
+        nothing is sent and uncached text comes back unchanged, as does text
+        identified as already being in the target language. Texts with a
+        sentence that was not in the cache are added to the missed set if one
+        is given: with cache_only those left untranslated, otherwise those a
+        provider was paid to translate.
+        """
+        # Identify languages locally before any cache lookup; text already in
+        # the target language is shown as it is
+        source_langs = {}
+        if CONFIG.get("language_detection", True):
+            source_langs = {text: detect_language(text) for text in texts}
+            same = {text for text, lang in source_langs.items() if is_target_language(lang, target_lang)}
+            if same:
+                if self.metrics is not None:
+                    self.metrics.increment('same_language_skipped', sum(text in same for text in texts))
+                pending = [text for text in texts if text not in same]
+                translated = dict(zip(pending, self._translate_detected(pending, target_lang, cache_only, source_langs, missed)))
+                return [translated.get(text, text) for text in texts]
+        return self._translate_detected(texts, target_lang, cache_only, source_langs, missed)
+    
+    def _translate_detected(self, texts, target_lang, cache_only, source_langs, missed=None):
+        """Segment texts and translate them, passing on their detected languages"""
+        if not CONFIG.get("segment_translation", True):
+            return self.translate_segments(texts, target_lang, cache_only, source_langs, missed)
+        
+        pieces = [split_segments(text) for text in texts]
+        segments = []
+        segment_langs = {}
+        for text, parts in zip(texts, pieces):
+            for segment in parts[::2]:
+                if needs_translation(segment.strip()):
+                    segments.append(segment)
+                    segment_langs.setdefault(segment, source_langs.get(text))
+        missed_segments = set() if missed is not None else None
+        translated = dict(zip(segments, self.translate_segments(segments, target_lang, cache_only, segment_langs, missed_segments)))
+        if missed_segments:
+            missed.update(text for text, parts in zip(texts, pieces) if any(part in missed_segments for part in parts[::2]))
+        
+        # Reassemble each text from its translated sentences and original separators
+        return [
+            ''.join(translated.get(part, part) if i % 2 == 0 else part for i, part in enumerate(parts))
+            for parts in pieces
+        ]
+    
+    def translate_segments(self, texts, target_lang, cache_only=False, source_langs=None, missed=None):
+        """Translate a list of texts, sending all cache misses in one batch
+        
+        Texts that another caller is already translating are not sent again;
+        this call waits for that request's result instead. source_langs maps
+        texts to a detected source language; the rest are auto-detected by the
+        provider. Cache entries stay keyed on 'auto' either way. missed is
+        filled as described for translate_texts.
+        """
+        translations = {}
+        misses = []
+        owned = {}
+        fuzzy_hits = 0
+        for text in texts:
+            if text in translations or text in misses:
+                continue
+            cached = self.cache.get(text, 'auto', target_lang)
+            if not cached:
+                cached = self.cache.get_similar(text, 'auto', target_lang)
+                fuzzy_hits += bool(cached)
+            if cached:
+                translations[text] = cached
+            else:
+                misses.append(text)
+        
+        if self.metrics is not None:
+            self.metrics.increment('translation_cache_hits', len(translations))
+            self.metrics.increment('translation_cache_misses', len(misses))
+            self.metrics.increment('fuzzy_cache_hits', fuzzy_hits)
+        
+        if misses and not cache_only:
+            if self.translator:
+                # Claim the texts nobody is translating yet, join the rest
+                joined = {}
+                with self.inflight_lock:
+                    for text in misses:
+                        key = (text, 'auto', target_lang)
+                        if key in self.inflight:
+                            joined[text] = self.inflight[key]
+                        else:
+                            owned[text] = self.inflight[key] = InflightTranslation()
+                
+                if joined and self.metrics is not None:
+                    self.metrics.increment('coalesced_calls', len(joined))
+                
+                if owned:
+                    self._translate_owned(owned, target_lang, translations, source_langs or {})
+                
+                for text, call in joined.items():
+                    if call.done.wait(30) and call.result is not None:
+                        translations[text] = call.result
+            else:
+                for text in misses:
+                    translations[text] = "[Translation service not available]"
+        
+        if missed is not None:
+            # Texts joined onto another caller's request were paid for by that caller
+            missed.update(misses if cache_only else (text for text in owned if text in translations))
+        
+        # Show original text if translation fails
+        return [translations.get(text, text) for text in texts]
+    
+    def warm_up(self):
+        """Let the client open its connections ahead of the first translation"""
+        if hasattr(self.translator, 'warm_up'):
+            self.translator.warm_up()
+    
+    def _translate_owned(self, owned, target_lang, translations, source_langs):
+        """Request the texts this caller claimed and publish the results to waiters
+        
+        There is one request per detected source language, and one for the
+        undetected, all in flight at once. Each group is cached and handed to
+        its waiters as soon as it answers, and a failed group only loses its
+        own texts.
+        """
+        groups = {}
+        for text in owned:
+            groups.setdefault(source_langs.get(text) or 'auto', []).append(text)
+        try:
+            # Quotas are checked and charged per provider by the router
+            start = time.perf_counter()
+            futures = {
+                self.executor.submit(self.request_translations, group, target_lang, source_lang): group
+                for source_lang, group in groups.items()
+            }
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    results = future.result()
+                except BudgetExhausted:
+                    continue  # Each provider warned once; cached translations are still shown
+                except Exception as e:
+                    print(f"Translation error: {e}")
+                    continue
+                if self.metrics is not None:
+                    self.metrics.increment('api_calls')
+                    self.metrics.increment('characters_sent', sum(len(text) for text in group))
+                for text, translation in zip(group, results):
+                    translations[text] = translation
+                    owned[text].result = translation
+                    self.cache.put(text, translation, 'auto', target_lang)
+                self._release(group, owned, target_lang)
+            if self.metrics is not None:
+                self.metrics.record('translate', time.perf_counter() - start)
+        finally:
+            self._release(owned, owned, target_lang)
+    
+    def _release(self, texts, owned, target_lang):
+        """Stop tracking texts as in flight and wake whoever waits for them"""
+        with self.inflight_lock:
+            for text in texts:
+                key = (text, 'auto', target_lang)
+                # A released text may already be claimed again by another caller
+                if self.inflight.get(key) is owned[text]:
+                    del self.inflight[key]
+                owned[text].done.set()
+    
+    def request_translations(self, texts, target_lang, source_lang='auto'):
+        """Send texts to the active translation service, batched where supported"""
+        return [result.text for result in translate_with(self.translator, texts, target_lang, source_lang)]
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
 
 class RegionSelector:
     """Transparent overlay for selecting screen regions"""
@@ -147,24 +2997,39 @@ class RegionSelector:
             self.root.destroy()
 
 class TranslationOverlay:
-    """Overlay window to display translations"""
+    """Overlay windows that display translations, one pooled window per region"""
     def __init__(self):
         self.windows = []
+        self.pool = {}
         self.active = True
-        
-    def show_translation(self, x, y, width, height, original_text, translated_text):
+    
+    def show_translation(self, x, y, width, height, original_text, translated_text, key=None):
+        """Show a translation over the original text, reusing the window for key if it exists"""
+        pooled = self.pool.get(key) if key is not None else None
+        if pooled and pooled['window'].winfo_exists():
+            return self._update_overlay(pooled, x, y, width, height, translated_text)
+        
+        overlay = self._create_overlay(x, y, width, height, translated_text)
+        if key is not None:
+            self.pool[key] = overlay
+        else:
+            # Auto-hide after delay
+            overlay['window'].after(CONFIG.get("overlay_timeout", 10000), lambda: self.remove_overlay(overlay['window']))
+        return overlay['window']
+    
+    def _create_overlay(self, x, y, width, height, translated_text):
         """Create overlay that covers the original text"""
         import tkinter as tk
         # Create new overlay window using regular tkinter for better overlay support
-        overlay = tk.Toplevel()
-        overlay.attributes('-topmost', True)
-        overlay.overrideredirect(True)
+        window = tk.Toplevel()
+        window.attributes('-topmost', True)
+        window.overrideredirect(True)
         
         # Set window size and position first
-        overlay.geometry(f"{width}x{height}+{x}+{y}")
+        window.geometry(f"{width}x{height}+{x}+{y}")
         
         # Create frame with background color
-        frame = tk.Frame(overlay, bg=CONFIG["overlay_bg_color"])
+        frame = tk.Frame(window, bg=CONFIG["overlay_bg_color"])
         frame.pack(fill=tk.BOTH, expand=True)
         
         # Calculate font size based on region height
@@ -183,47 +3048,137 @@ class TranslationOverlay:
         label.place(relx=0.5, rely=0.5, anchor="center")
         
         # Set transparency
-        overlay.attributes('-alpha', CONFIG["overlay_opacity"])
+        window.attributes('-alpha', CONFIG["overlay_opacity"])
         
-        # Make click-through on Windows
+        # Make click-through on Windows (only needed once per window)
         if WINDOWS_AVAILABLE:
-            overlay.update()
-            hwnd = ctypes.windll.user32.GetParent(overlay.winfo_id())
+            window.update()
+            hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
             # Set extended window style for click-through
             style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
             style |= win32con.WS_EX_LAYERED | win32con.WS_EX_TRANSPARENT
             win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, style)
         
-        self.windows.append(overlay)
-        
-        # Auto-hide after delay
-        overlay.after(10000, lambda: self.remove_overlay(overlay))
+        self.windows.append(window)
         
+        overlay = {
+            'window': window,
+            'label': label,
+            'geometry': (width, height, x, y),
+            'font_size': font_size,
+            'hide_job': None
+        }
+        self._schedule_hide(overlay)
         return overlay
     
+    def _update_overlay(self, overlay, x, y, width, height, translated_text):
+        """Reconfigure a pooled window instead of recreating it"""
+        window = overlay['window']
+        if overlay['geometry'] != (width, height, x, y):
+            window.geometry(f"{width}x{height}+{x}+{y}")
+            font_size = max(10, min(CONFIG["font_size"], int(height * 0.5)))
+            overlay['label'].configure(font=("Segoe UI", font_size, "bold"), wraplength=width - 10)
+            overlay['geometry'] = (width, height, x, y)
+        
+        overlay['label'].configure(text=translated_text)
+        if window.state() == 'withdrawn':
+            window.deiconify()
+        self._schedule_hide(overlay)
+        return window
+    
+    def _schedule_hide(self, overlay):
+        """Hide (but keep) a pooled window if it is not updated for a while"""
+        window = overlay['window']
+        if overlay['hide_job']:
+            window.after_cancel(overlay['hide_job'])
+        overlay['hide_job'] = window.after(CONFIG.get("overlay_timeout", 10000), window.withdraw)
+    
     def remove_overlay(self, overlay):
         """Remove specific overlay"""
         if overlay in self.windows:
             self.windows.remove(overlay)
+            for key, pooled in list(self.pool.items()):
+                if pooled['window'] is overlay:
+                    del self.pool[key]
             overlay.destroy()
     
+    def remove_key(self, key):
+        """Remove the pooled window for key"""
+        pooled = self.pool.get(key)
+        if pooled:
+            self.remove_overlay(pooled['window'])
+    
+    def hide_key(self, key):
+        """Hide the pooled window for key but keep it for reuse"""
+        pooled = self.pool.get(key)
+        if pooled and pooled['window'].winfo_exists():
+            if pooled['hide_job']:
+                pooled['window'].after_cancel(pooled['hide_job'])
+                pooled['hide_job'] = None
+            pooled['window'].withdraw()
+    
     def clear_all(self):
         """Remove all overlays"""
         for window in self.windows:
             window.destroy()
         self.windows.clear()
+        self.pool.clear()
 
 class ScreenTranslator:
     """Main translator application"""
     def __init__(self):
         self.translator = None
+        self.backends = []
         self.setup_translator()
-        self.cache = TranslationCache(CONFIG["cache_size"])
+        self.budget = self.create_budget()
+        if self.backends:
+            self.translator = TranslationRouter(
+                self.backends,
+                latency_slo=CONFIG.get("latency_slo", 2.0),
+                error_rate=CONFIG.get("breaker_error_rate", 0.5),
+                cooldown=CONFIG.get("breaker_cooldown", 30),
+                budgets=self.budget
+            )
+        self.cache = TranslationCache(
+            CONFIG["cache_size"],
+            db_path=CONFIG.get("cache_db_path"),
+            ttl=CONFIG.get("cache_ttl"),
+            max_bytes=CONFIG.get("cache_max_bytes"),
+            fuzzy_threshold=CONFIG.get("fuzzy_threshold"),
+            fuzzy_size=CONFIG.get("fuzzy_cache_size", 50000)
+        )
+        # Warm the in-memory tier from disk without blocking startup
+        threading.Thread(target=self.cache.warm, daemon=True).start()
         self.overlay = TranslationOverlay()
+        self.overlay_ids = itertools.count()
+        self.metrics = Metrics()
+        self.translation_service = TranslationService(
+            self.translator, self.cache, metrics=self.metrics, budget=self.budget
+        )
+        self.screen_capture = ScreenCapture()
+        ocr_pool = None
+        if CONFIG.get("ocr_processes", 0) > 0:
+            ocr_pool = OCRProcessPool(CONFIG["ocr_processes"])
+        self.processor = RegionProcessor(metrics=self.metrics, ocr_pool=ocr_pool)
         self.monitoring_regions = []
         self.monitoring_active = False
-        self.monitor_thread = None
-        self.previous_hashes = {}
+        self.pipeline = None
+        
+        self.metrics.register_gauge('ocr_cache_hit_ratio', lambda: round(self.processor.ocr_cache.hit_ratio, 3))
+        self.metrics.register_gauge('frames_dropped', lambda: self.pipeline.dropped_frames if self.pipeline else 0)
+        self.metrics.register_gauge('regions', lambda: len(self.monitoring_regions))
+        for provider, budget in self.budget.budgets.items():
+            self.metrics.register_gauge(f'characters_remaining_{provider}', budget.remaining)
+        self.metrics.register_gauge('hedged_requests', lambda: getattr(self.translator, 'hedged', 0))
+        self.metrics.register_gauge('failovers', lambda: getattr(self.translator, 'failovers', 0))
+        self.metrics_exporter = MetricsExporter(
+            self.metrics,
+            path=CONFIG.get("metrics_file"),
+            port=CONFIG.get("metrics_port"),
+            interval=CONFIG.get("metrics_interval", 10)
+        )
+        self.metrics_exporter.start()
+        self.next_region_id = 0
         
         # Create main window
         self.create_gui()
@@ -241,73 +3196,14 @@ class ScreenTranslator:
                     from google.cloud import translate_v3 as translate_v3
                     from google.oauth2 import service_account
                     
-                    # Create credentials from API key
-                    import requests
-                    
-                    class GoogleTranslateWithAPIKey:
-                        def __init__(self, api_key):
-                            self.api_key = api_key
-                            self.base_url = "https://translation.googleapis.com/language/translate/v2"
-                        
-                        def translate(self, text, target_language, source_language=None):
-                            # Clean and validate text
-                            if not text or not text.strip():
-                                return {'translatedText': ''}
-                            
-                            # Limit text length (Google Translate has limits)
-                            if len(text) > 5000:
-                                text = text[:5000]
-                            
-                            params = {
-                                'q': text.strip(),
-                                'target': target_language,
-                                'key': self.api_key,
-                                'format': 'text'  # Specify plain text format
-                            }
-                            if source_language and source_language != 'auto':
-                                params['source'] = source_language
-                            
-                            try:
-                                response = requests.get(self.base_url, params=params, timeout=10)
-                                
-                                if response.status_code == 200:
-                                    result = response.json()
-                                    if 'data' in result and 'translations' in result['data']:
-                                        return {
-                                            'translatedText': result['data']['translations'][0]['translatedText']
-                                        }
-                                    else:
-                                        print(f"Unexpected API response: {result}")
-                                        return {'translatedText': text}
-                                else:
-                                    error_data = response.json() if response.content else {}
-                                    error_msg = error_data.get('error', {}).get('message', 'Unknown error')
-                                    print(f"Translation API error {response.status_code}: {error_msg}")
-                                    print(f"Request URL: {response.url}")
-                                    print(f"Text that failed: {text[:100]}...")
-                                    
-                                    if response.status_code == 403:
-                                        raise Exception(f"API key error: {error_msg}")
-                                    elif response.status_code == 400:
-                                        # Bad request - possibly due to special characters or language code
-                                        print(f"Bad request - text might contain special characters")
-                                        return {'translatedText': text}  # Return original text
-                                    else:
-                                        raise Exception(f"Translation API error: {response.status_code} - {error_msg}")
-                            except requests.exceptions.Timeout:
-                                print("Translation request timed out")
-                                return {'translatedText': text}
-                            except requests.exceptions.RequestException as e:
-                                print(f"Network error: {e}")
-                                return {'translatedText': text}
-                    
-                    self.translator = GoogleTranslateWithAPIKey(CONFIG["google_cloud_api_key"])
+                    client = GoogleTranslateWithAPIKey(CONFIG["google_cloud_api_key"])
                     print("Using Google Cloud Translation with API key")
                     
                     # Test the API key
                     try:
-                        test_result = self.translator.translate("Hello", "es")
-                        print(f"API key test successful: Hello -> {test_result['translatedText']}")
+                        test_result = client.translate_many(["Hello"], "es")[0]
+                        print(f"API key test successful: Hello -> {test_result.text}")
+                        self.backends.append(('google', client))
                     except Exception as e:
                         print(f"API key test failed: {e}")
                         messagebox.showwarning(
@@ -319,11 +3215,13 @@ class ScreenTranslator:
                     
                 # Option 2: Use service account credentials from environment
                 elif os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
-                    self.translator = translate.Client()
+                    self.backends.append(('google', translate.Client()))
                     print("Using Google Cloud Translation with service account")
                 else:
                     print("No Google Cloud credentials found")
-                    self.setup_fallback_translator()
+                
+                # DeepL and googletrans stay available for failover
+                self.setup_fallback_translator()
             except Exception as e:
                 print(f"Error setting up Google Cloud Translation: {e}")
                 self.setup_fallback_translator()
@@ -331,140 +3229,8 @@ class ScreenTranslator:
             self.setup_fallback_translator()
     
     def setup_fallback_translator(self):
-        """Setup DeepL as fallback translation method"""
+        """Add DeepL and googletrans as fallback translation backends"""
         try:
-            # Try DeepL API as the primary fallback
-            import requests
-            
-            class DeepLTranslateClient:
-                def __init__(self, api_key=None, use_free=True):
-                    self.api_key = api_key
-                    # DeepL free vs pro API endpoints
-                    self.base_url = "https://api-free.deepl.com/v2" if use_free else "https://api.deepl.com/v2"
-                    self.session = requests.Session()
-                    
-                    # Language mapping for DeepL
-                    self.lang_map = {
-                        'zh-cn': 'ZH',
-                        'zh-tw': 'ZH',
-                        'zh': 'ZH',
-                        'en': 'EN',
-                        'es': 'ES',
-                        'fr': 'FR',
-                        'de': 'DE',
-                        'it': 'IT',
-                        'pt': 'PT',
-                        'ru': 'RU',
-                        'ja': 'JA',
-                        'ko': 'KO',
-                        'ar': 'AR',
-                        'hi': 'HI',
-                        'nl': 'NL',
-                        'pl': 'PL',
-                        'sv': 'SV',
-                        'da': 'DA',
-                        'fi': 'FI',
-                        'no': 'NB',
-                        'cs': 'CS',
-                        'hu': 'HU',
-                        'ro': 'RO',
-                        'sk': 'SK',
-                        'sl': 'SL',
-                        'et': 'ET',
-                        'lv': 'LV',
-                        'lt': 'LT',
-                        'bg': 'BG',
-                        'el': 'EL',
-                        'tr': 'TR',
-                        'uk': 'UK',
-                        'id': 'ID',
-                    }
-                    
-                    if self.api_key:
-                        self._test_connection()
-                
-                def _test_connection(self):
-                    """Test if DeepL API key is valid"""
-                    try:
-                        headers = {'Authorization': f'DeepL-Auth-Key {self.api_key}'}
-                        response = self.session.get(f"{self.base_url}/usage", headers=headers, timeout=5)
-                        if response.status_code == 200:
-                            usage_data = response.json()
-                            print(f"Connected to DeepL API - Usage: {usage_data.get('character_count', 0)}/{usage_data.get('character_limit', 'unlimited')} characters")
-                            return True
-                        else:
-                            raise Exception(f"API returned status {response.status_code}")
-                    except Exception as e:
-                        raise Exception(f"Cannot connect to DeepL API: {e}")
-                
-                def translate(self, text, dest, src='auto'):
-                    """Translate text using DeepL API"""
-                    if not text or not text.strip():
-                        return type('obj', (object,), {'text': ''})()
-                    
-                    # Limit text length (DeepL free has 500,000 char/month limit)
-                    if len(text) > 5000:
-                        text = text[:5000]
-                    
-                    # Map language codes to DeepL format
-                    target_lang = self.lang_map.get(dest.lower(), dest.upper())
-                    source_lang = self.lang_map.get(src.lower(), src.upper()) if src != 'auto' else None
-                    
-                    # Check if target language is supported
-                    if target_lang not in self.lang_map.values():
-                        print(f"Language {dest} not supported by DeepL")
-                        return type('obj', (object,), {'text': text})()
-                    
-                    data = {
-                        'text': text.strip(),
-                        'target_lang': target_lang,
-                    }
-                    
-                    if source_lang and source_lang != 'AUTO':
-                        data['source_lang'] = source_lang
-                    
-                    headers = {
-                        'Authorization': f'DeepL-Auth-Key {self.api_key}',
-                        'Content-Type': 'application/x-www-form-urlencoded'
-                    }
-                    
-                    try:
-                        response = self.session.post(
-                            f"{self.base_url}/translate",
-                            data=data,
-                            headers=headers,
-                            timeout=15
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            translated_text = result['translations'][0]['text']
-                            # Create an object similar to googletrans result
-                            return type('obj', (object,), {'text': translated_text})()
-                        elif response.status_code == 403:
-                            print("DeepL API key invalid or quota exceeded")
-                            return type('obj', (object,), {'text': text})()
-                        elif response.status_code == 456:
-                            print("DeepL quota exceeded")
-                            return type('obj', (object,), {'text': text})()
-                        else:
-                            error_msg = f"DeepL API error: {response.status_code}"
-                            if response.content:
-                                try:
-                                    error_data = response.json()
-                                    error_msg = error_data.get('message', error_msg)
-                                except:
-                                    pass
-                            print(error_msg)
-                            return type('obj', (object,), {'text': text})()
-                            
-                    except requests.exceptions.Timeout:
-                        print("DeepL request timed out")
-                        return type('obj', (object,), {'text': text})()
-                    except requests.exceptions.RequestException as e:
-                        print(f"DeepL network error: {e}")
-                        return type('obj', (object,), {'text': text})()
-            
             # Check if DeepL API key is available
             deepl_api_key = CONFIG.get("deepl_api_key") or os.environ.get("DEEPL_API_KEY")
             
@@ -472,25 +3238,23 @@ class ScreenTranslator:
                 try:
                     # Determine if it's a free or pro key based on the key format
                     use_free = deepl_api_key.endswith(':fx')
-                    self.translator = DeepLTranslateClient(deepl_api_key, use_free)
-                    self.fallback_mode = True
+                    self.backends.append(('deepl', DeepLTranslateClient(deepl_api_key, use_free)))
                     print(f"Using DeepL API ({'Free' if use_free else 'Pro'} tier)")
-                    return
                 except Exception as e:
                     print(f"DeepL API setup failed: {e}")
             
-            # If no DeepL API key, try googletrans as fallback
+            # googletrans needs no key, so it is the last resort behind the APIs
             try:
                 from googletrans import Translator as GoogleTranslator
-                self.translator = GoogleTranslator()
-                self.fallback_mode = True
-                print("Using googletrans as fallback (DeepL API key not configured)")
-                return
+                self.backends.append(('googletrans', GoogleTranslator()))
+                print("Using googletrans as fallback")
             except ImportError:
                 pass
             
-            # No translation service available
-            raise Exception("No translation service available")
+            self.setup_offline_translator()
+            
+            if not self.backends:
+                raise Exception("No translation service available")
             
         except Exception as e:
             print(f"Error setting up fallback translator: {e}")
@@ -504,6 +3268,49 @@ class ScreenTranslator:
             )
             self.translator = None
         
+    def setup_offline_translator(self):
+        """Add the local CPU backend when Argos Translate models are installed"""
+        placement = CONFIG.get("offline_backend")
+        if not OFFLINE_TRANSLATION_AVAILABLE or not placement:
+            return
+        try:
+            client = OfflineTranslateClient()
+        except Exception as e:
+            print(f"Offline translation setup failed: {e}")
+            return
+        if not client.packages:
+            print("No Argos Translate models installed, offline translation disabled")
+            return
+        
+        if placement == "primary":
+            self.backends.insert(0, ('offline', client))
+        else:
+            # Ahead of googletrans, which is rate limited and less reliable
+            names = [name for name, _ in self.backends]
+            position = names.index('googletrans') if 'googletrans' in names else len(names)
+            self.backends.insert(position, ('offline', client))
+        print(f"Offline translation available for {len(client.packages)} language pair(s)")
+    
+    def create_budget(self):
+        """Rate limiter and character quota for each translation backend, sharing one ledger"""
+        ledger = CharacterLedger(CONFIG.get("usage_ledger_path"))
+        budgets = {}
+        for provider, _ in self.backends:
+            budgets[provider] = TranslationBudget(
+                provider,
+                ledger,
+                limit=CONFIG.get("character_budgets", {}).get(provider),
+                # Local models have no request rate to respect
+                rate=None if provider == 'offline' else CONFIG.get("requests_per_second"),
+                burst=CONFIG.get("request_burst"),
+                reconcile_interval=CONFIG.get("usage_reconcile_interval", 600)
+            )
+        return TranslationBudgets(
+            budgets,
+            reserve=CONFIG.get("budget_reserve", 0.1),
+            low_interval=CONFIG.get("budget_low_interval", 30)
+        )
+    
     def create_gui(self):
         """Create the modern control panel using CustomTkinter"""
         self.root = ctk.CTk()
@@ -670,7 +3477,17 @@ class ScreenTranslator:
             text="🟢 Ready",
             font=ctk.CTkFont(size=12, weight="bold")
         )
-        self.status_label.grid(row=0, column=0, padx=20, pady=15)
+        self.status_label.grid(row=0, column=0, padx=20, pady=(15, 5), sticky="w")
+        
+        # Live metrics summary
+        self.metrics_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color=("gray70", "gray50"),
+            justify="left"
+        )
+        self.metrics_label.grid(row=1, column=0, padx=20, pady=(0, 15), sticky="w")
         
         # Active regions frame
         regions_header_frame = ctk.CTkFrame(self.root, corner_radius=10)
@@ -745,7 +3562,7 @@ class ScreenTranslator:
             base_url = "https://api-free.deepl.com/v2" if use_free else "https://api.deepl.com/v2"
             
             headers = {'Authorization': f'DeepL-Auth-Key {api_key}'}
-            response = requests.get(f"{base_url}/usage", headers=headers, timeout=10)
+            response = get_http_session().get(f"{base_url}/usage", headers=headers, timeout=10)
             
             if response.status_code == 200:
                 usage_data = response.json()
@@ -820,6 +3637,9 @@ class ScreenTranslator:
         def on_clear():
             self.root.after(0, self.overlay.clear_all)
         
+        if not PYNPUT_AVAILABLE:
+            return
+        
         # Start keyboard listener in background
         self.hotkey_listener = keyboard.GlobalHotKeys({
             '<ctrl>+<shift>+t': on_hotkey,
@@ -840,14 +3660,9 @@ class ScreenTranslator:
     
     def add_monitoring_region(self, region):
         """Add a region to monitor for changes"""
-        region_id = len(self.monitoring_regions)
-        region_data = {
-            'id': region_id,
-            'bounds': region,
-            'last_text': '',
-            'last_translation': '',
-            'overlay': None
-        }
+        region_id = self.next_region_id
+        self.next_region_id += 1
+        region_data = create_region_data(region_id, region)
         
         self.monitoring_regions.append(region_data)
         
@@ -864,6 +3679,8 @@ class ScreenTranslator:
             anchor="w"
         )
         region_info.grid(row=0, column=0, padx=15, pady=10, sticky="w")
+        region_data['info_label'] = region_info
+        region_data['info_text'] = region_info.cget("text")
         
         # Remove button
         remove_btn = ctk.CTkButton(
@@ -885,16 +3702,16 @@ class ScreenTranslator:
         if not self.monitoring_active:
             self.start_monitoring()
         
-        # Perform initial translation
-        self.process_region(region_data)
+        # Perform initial translation without waiting for the next tick
+        self.pipeline.wake()
     
     def remove_region(self, region_id):
         """Remove a monitoring region"""
         for i, region in enumerate(self.monitoring_regions):
             if region['id'] == region_id:
-                # Remove overlay
-                if region['overlay']:
-                    self.overlay.remove_overlay(region['overlay'])
+                # Remove overlays
+                for key in list(region['overlays']) + region['spare_overlays']:
+                    self.overlay.remove_key(key)
                 
                 # Remove from UI
                 if 'frame' in region:
@@ -902,6 +3719,9 @@ class ScreenTranslator:
                 
                 # Remove from list
                 self.monitoring_regions.pop(i)
+                self.processor.forget_region(region_id)
+                self.metrics.forget_region(region_id)
+                self.budget.forget(region_id)
                 break
         
         # Stop monitoring if no regions left
@@ -913,148 +3733,98 @@ class ScreenTranslator:
         self.monitoring_active = True
         self.status_label.configure(text="🔄 Monitoring")
         
-        def monitor_loop():
-            while self.monitoring_active:
-                for region in self.monitoring_regions:
-                    self.process_region(region)
-                
-                time.sleep(CONFIG["update_interval"] / 1000.0)
+        # Have a warm connection ready by the time the first region is translated
+        threading.Thread(target=self.translation_service.warm_up, daemon=True).start()
         
-        self.monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.pipeline = TranslationPipeline(self)
+        self.pipeline.start()
+        self.update_monitoring_stats()
+        self.render_pending()
+    
+    def render_pending(self):
+        """Drain overlay updates from the pipeline on the Tk thread"""
+        if not self.monitoring_active or not self.pipeline:
+            return
+        self.pipeline.drain_render_queue()
+        self.root.after(CONFIG.get("render_interval", 30), self.render_pending)
+    
+    def update_monitoring_stats(self):
+        """Refresh region polling rates and the live metrics summary"""
+        if not self.monitoring_active or not self.pipeline:
+            return
+        for region in list(self.monitoring_regions):
+            if 'info_label' in region:
+                rate = self.pipeline.scheduler.rate(region['id'])
+                region['info_label'].configure(text=f"{region['info_text']} · {rate:.1f}/s")
+        self.status_label.configure(
+            text=f"🔄 Monitoring · OCR cache {self.processor.ocr_cache.hit_ratio:.0%} hits"
+        )
+        self.metrics_label.configure(text=self.metrics.live_summary())
+        self.root.after(1000, self.update_monitoring_stats)
     
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring_active = False
+        if self.pipeline:
+            self.pipeline.stop()
         self.status_label.configure(text="🟢 Ready")
     
-    def process_region(self, region_data):
-        """Process a single region - capture, OCR, translate"""
-        try:
-            # Capture region
-            x1, y1, x2, y2 = region_data['bounds']
-            screenshot = pyautogui.screenshot(region=(x1, y1, x2-x1, y2-y1))
-            
-            # Check if content changed using perceptual hash
-            img_array = np.array(screenshot)
-            img_hash = self.compute_image_hash(img_array)
-            
-            if region_data['id'] in self.previous_hashes:
-                if img_hash == self.previous_hashes[region_data['id']]:
-                    return  # No change
-            
-            self.previous_hashes[region_data['id']] = img_hash
-            
-            # Preprocess image for better OCR
-            processed_img = self.preprocess_image(screenshot)
-            
-            # Extract text with data about positions
-            ocr_data = pytesseract.image_to_data(processed_img, output_type=pytesseract.Output.DICT)
-            
-            # Combine all text with better filtering
-            text_blocks = []
-            for i in range(len(ocr_data['level'])):
-                conf = int(ocr_data['conf'][i])
-                if conf > CONFIG.get('min_confidence', 30):  # Use configurable confidence threshold
-                    text = ocr_data['text'][i].strip()
-                    if text and len(text) > 1:  # Skip single characters
-                        text_blocks.append(text)
-            
-            # Join text blocks with spaces and clean up
-            text = ' '.join(text_blocks)
-            # Remove extra whitespace
-            text = ' '.join(text.split())
-            # Remove any null characters that might cause issues
-            text = text.replace('\x00', '').replace('\r', ' ').replace('\n', ' ')
-            
-            if text and text != region_data['last_text']:
-                region_data['last_text'] = text
-                
-                # Skip if text is too short or just numbers/symbols
-                if len(text) < 2 or text.isdigit():
-                    return
-                
-                # Check cache first
-                cached = self.cache.get(text, 'auto', self.target_lang.get())
-                if cached:
-                    translation = cached
-                else:
-                    # Translate
-                    try:
-                        # Handle empty text
-                        if len(text.strip()) == 0:
-                            return
-                        
-                        if self.translator:
-                            if hasattr(self, 'fallback_mode') and self.fallback_mode:
-                                # Using googletrans fallback
-                                result = self.translator.translate(text, dest=self.target_lang.get())
-                                translation = result.text
-                            else:
-                                # Using Google Cloud Translation
-                                result = self.translator.translate(
-                                    text, 
-                                    target_language=self.target_lang.get()
-                                )
-                                translation = result['translatedText']
-                            
-                            self.cache.put(text, translation, 'auto', self.target_lang.get())
-                        else:
-                            translation = "[Translation service not available]"
-                    except Exception as e:
-                        print(f"Translation error: {e}")
-                        translation = text  # Show original text if translation fails
-                
-                region_data['last_translation'] = translation
-                
-                # Update overlay
-                if region_data['overlay']:
-                    self.overlay.remove_overlay(region_data['overlay'])
-                
-                # Create overlay directly over the original text
-                region_data['overlay'] = self.overlay.show_translation(
-                    x1, y1, x2-x1, y2-y1,
-                    text, translation
-                )
-                
-        except Exception as e:
-            print(f"Error processing region: {e}")
+    def is_region_active(self, region_data):
+        """Check that a region has not been removed while it was in the pipeline"""
+        return any(region is region_data for region in self.monitoring_regions)
     
-    def preprocess_image(self, image):
-        """Preprocess image for better OCR accuracy"""
-        # Convert PIL image to OpenCV format
-        img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Apply thresholding to get better contrast
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Denoise
-        denoised = cv2.medianBlur(thresh, 1)
-        
-        # Convert back to PIL Image
-        return Image.fromarray(denoised)
+    def capture_regions(self, regions):
+        """Capture all regions with a single screen grab, one numpy view per region"""
+        return self.screen_capture.grab([region['bounds'] for region in regions])
     
-    def compute_image_hash(self, img_array):
-        """Compute perceptual hash of image for change detection"""
-        # Resize to 8x8 and convert to grayscale
-        img = cv2.resize(img_array, (8, 8))
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-        
-        # Compute mean
-        mean = gray.mean()
-        
-        # Create hash based on whether pixels are above or below mean
-        hash_str = ''.join(['1' if pixel > mean else '0' for pixel in gray.flatten()])
+    def show_region_translation(self, region_data, blocks, translations):
+        """Show each text block's translation over the block itself (Tk thread only)
+        
+        A block takes over the window of the shown block it overlaps most (the
+        same line with new text, say), windows of unchanged blocks are left
+        alone and windows of blocks that are gone are hidden and kept for the
+        next new block, so subtitles that blank between lines do not create a
+        window per line.
+        """
+        x1, y1 = region_data['bounds'][:2]
+        region_data['last_translation'] = '\n'.join(translations)
+        
+        shown = dict(region_data['overlays'])
+        spare = region_data['spare_overlays']
+        overlays = {}
+        for (box, text), translation in zip(blocks, translations):
+            key = max(shown, key=lambda k: box_overlap(shown[k][0], box), default=None)
+            if key is None or box_overlap(shown[key][0], box) == 0:
+                while spare and spare[-1] not in self.overlay.pool:
+                    spare.pop()  # Removed along with all overlays
+                key = spare.pop() if spare else (region_data['id'], next(self.overlay_ids))
+            if shown.pop(key, None) != (box, translation) or key not in self.overlay.pool:
+                left, top, right, bottom = box
+                self.overlay.show_translation(
+                    x1 + left, y1 + top, right - left, bottom - top,
+                    text, translation,
+                    key=key
+                )
+            overlays[key] = (box, translation)
         
-        return hash_str
+        for key in shown:
+            self.overlay.hide_key(key)
+            spare.append(key)
+        region_data['overlays'] = overlays
     
     def on_closing(self):
         """Clean up when closing the application"""
         self.monitoring_active = False
+        if self.pipeline:
+            self.pipeline.stop()
         self.overlay.clear_all()
+        self.translation_service.close()
+        self.cache.close()
+        self.budget.close()
+        if self.translator:
+            self.translator.close()
+        self.processor.close()
+        self.metrics_exporter.stop()
         if hasattr(self, 'hotkey_listener'):
             self.hotkey_listener.stop()
         self.root.destroy()
@@ -1083,9 +3853,10 @@ def main():
         print(f"Error: {e}")
         return
     
-    # Check Tesseract installation
+    # Check Tesseract installation (tesserocr does not need the executable)
     try:
-        pytesseract.get_tesseract_version()
+        if not TESSEROCR_AVAILABLE:
+            pytesseract.get_tesseract_version()
     except Exception:
         messagebox.showwarning(
             "Tesseract Not Found",